@@ -3,9 +3,17 @@
 ArtNet Receiver - Receive and display DMX channels via ArtNet
 This application starts an ArtNet server and displays received DMX values.
 """
+import asyncio
+import json
 import logging
+import os
+import socket
+import sys
+import threading
 import time
-from stupidArtnet import StupidArtnetServer
+from functools import partial
+import numpy as np
+from led_wall.artnet_input import ArtNetInput
 from nicegui import ui, app
 
 from led_wall.ui.settings_manager import SettingsElement, SettingsManager
@@ -13,6 +21,27 @@ from led_wall.ui.settings_manager import SettingsElement, SettingsManager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RECEIVE_THREAD_PRIORITY = 10  # SCHED_FIFO priority of the receive thread when pinned to a CPU
+RECEIVE_BUFFER_SIZE = 12 * 1024 * 1024  # 12 MiB socket receive buffer to survive bursts of many universes
+UI_REFRESH_INTERVAL = 1 / 30  # seconds between UI updates, independent of the packet rate
+
+# Precomputed cell style and label text for every possible DMX value, background intensity ranges from 20 to 100
+STYLE_LUT = [f'background-color: rgb({20 + v * 80 // 255}, {20 + v * 80 // 255}, {20 + v * 80 // 255 + (20 if v > 0 else 0)});' for v in range(256)]
+TEXT_LUT = [str(v) for v in range(256)]
+
+# Client side handler applying a whole batch of cell updates received in a single message,
+# cells are addressed by their NiceGUI element id which is rendered as the DOM id "c<id>"
+APPLY_BATCH_SCRIPT = '''<script>
+window.applyDmxBatch = batch => {
+    for (const [id, style, text] of batch) {
+        const cell = document.getElementById('c' + id);
+        if (!cell) continue;
+        cell.style.cssText = style;
+        if (cell.firstElementChild) cell.firstElementChild.textContent = text;
+    }
+};
+</script>'''
+
 
 class ArtNetReceiver:
     def __init__(self):
@@ -26,23 +55,34 @@ class ArtNetReceiver:
         self.n_universes = 1
         self.start_channel = 1
         self.n_channels = 16
+        self.cpu_core = -1  # CPU core the receive thread is pinned to, -1 to disable
         
         # ArtNet server
         self.server = None
-        self.listener_ids = []
         self.is_listening = False
         
-        # Data storage
-        self.universe_data = {}  # {universe: [data]}
+        # Data storage, one preallocated row per universe written only by the receive thread
+        self._rx_base = self.start_universe
+        self.universe_data = np.zeros((0, 512), dtype=np.uint8)  # latest data per universe index
+        self._flushing = False
+        self._rx_dirty = 0  # bitmask of universe indices with new data since the last UI refresh
+        self._rx_lock = threading.Lock()  # guards _rx_dirty, marked by the receive thread and taken by the UI
+        self._rx_count = 0  # packets received since listening started
+        self._seen_count = 0  # packets already accounted in the UI
         self.last_update = time.time()
         self.packet_count = 0
+        self._last_ts_sec = -1  # second of the formatted timestamp, only reformatted once per second
+        self._last_ts_str = 'Never'
         
         # UI elements
         self.status_label = None
         self.listen_button = None
         self.packet_counter_label = None
         self.last_update_label = None
-        self.channel_elements = {}  # {universe: [(label, container)]}
+        self.channel_elements = []  # [[cell element id]] indexed by universe - start universe of the rendered grid
+        self._last_vals = []  # [np.ndarray] values currently shown, -1 if not yet shown
+        self._u_base = self.start_universe  # first universe of the rendered grid
+        self._u_count = 0  # number of universes in the rendered grid
         
         # Settings elements
         self.settings_elements = [
@@ -51,7 +91,7 @@ class ArtNetReceiver:
                 input=ui.input,
                 settings_id='listen_ip',
                 default_value=self.listen_ip,
-                on_change=lambda e: setattr(self, 'listen_ip', e.value),
+                on_change=partial(self._set_value, 'listen_ip'),
                 manager=self.settings_manager,
                 placeholder='0.0.0.0 (all interfaces)'
             ),
@@ -60,7 +100,7 @@ class ArtNetReceiver:
                 input=ui.number,
                 settings_id='listen_port',
                 default_value=self.listen_port,
-                on_change=lambda e: setattr(self, 'listen_port', int(e.value) if e.value is not None else 6454),
+                on_change=partial(self._set_int, 'listen_port', 6454),
                 manager=self.settings_manager,
                 precision=0,
                 min=1024,
@@ -71,7 +111,7 @@ class ArtNetReceiver:
                 input=ui.number,
                 settings_id='universe',
                 default_value=self.start_universe,
-                on_change=lambda e: setattr(self, 'start_universe', int(e.value) if e.value is not None else 0),
+                on_change=partial(self._set_int, 'start_universe', 0),
                 manager=self.settings_manager,
                 precision=0,
                 min=0,
@@ -82,7 +122,7 @@ class ArtNetReceiver:
                 input=ui.number,
                 settings_id='n_universes',
                 default_value=self.n_universes,
-                on_change=lambda e: setattr(self, 'n_universes', int(e.value) if e.value is not None else 1),
+                on_change=partial(self._set_int, 'n_universes', 1),
                 manager=self.settings_manager,
                 precision=0,
                 min=1,
@@ -93,7 +133,7 @@ class ArtNetReceiver:
                 input=ui.number,
                 settings_id='start_channel',
                 default_value=self.start_channel,
-                on_change=lambda e: setattr(self, 'start_channel', int(e.value) if e.value is not None else 1),
+                on_change=partial(self._set_int, 'start_channel', 1),
                 manager=self.settings_manager,
                 precision=0,
                 min=1,
@@ -110,60 +150,128 @@ class ArtNetReceiver:
                 min=1,
                 max=512
             ),
+            SettingsElement(
+                label='Receive CPU Core',
+                input=ui.number,
+                settings_id='cpu_core',
+                default_value=self.cpu_core,
+                on_change=partial(self._set_int, 'cpu_core', -1),
+                manager=self.settings_manager,
+                precision=0,
+                min=-1,
+                max=(os.cpu_count() or 1) - 1
+            ),
         ]
     
+    def _set_value(self, name: str, event):
+        """Settings on_change handler storing the value in attribute name"""
+        setattr(self, name, event.value)
+    
+    def _set_int(self, name: str, default: int, event):
+        """Settings on_change handler storing the value as int in attribute name, default if cleared"""
+        setattr(self, name, int(event.value) if event.value is not None else default)
+    
     def on_channel_count_change(self, event):
         """Handle change in number of channels to display"""
         if event.value is not None:
             self.n_channels = int(event.value)
     
-    def on_dmx_received(self, data, universe: int):
-        """Callback when DMX data is received"""
+    def on_dmx_received(self, data: memoryview, universe: int):
+        """Callback on the ArtNet receive thread, only stores the data so the thread returns to receiving quickly"""
+        idx = universe - self._rx_base
+        # Zero-copy view of the payload, copied into the preallocated row with a single memcpy
+        payload = np.frombuffer(data, dtype=np.uint8)
+        length = min(payload.size, 512)
+        row = self.universe_data[idx]
+        row[:length] = payload[:length]
+        row[length:] = 0
+        with self._rx_lock:
+            self._rx_dirty |= 1 << idx
+        self._rx_count += 1
+
+    def flush_dirty(self):
+        """Update the UI of all universes which received data since the last refresh"""
+        if self._flushing:
+            return
+        
+        self._flushing = True
         try:
-            self.packet_count += 1
-            self.last_update = time.time()
+            # Swap the dirty mask out atomically so no mark of a concurrent packet is lost
+            with self._rx_lock:
+                mask, self._rx_dirty = self._rx_dirty, 0
+            if not mask:
+                return
             
-            # Store data
-            self.universe_data[universe] = data
+            count = self._rx_count
+            self.packet_count += count - self._seen_count
+            self._seen_count = count
+            self.last_update = time.time()
             
-            # Update the specific universe display
-            self.update_universe_display(universe)
+            # Collect all changed cells and send them to the browser in a single message
+            batch = []
+            while mask:
+                bit = mask & -mask  # lowest set bit
+                mask ^= bit
+                idx = bit.bit_length() - 1
+                self.update_universe_display(self._rx_base + idx, self.universe_data[idx], batch)
+            if batch:
+                ui.run_javascript(f'applyDmxBatch({json.dumps(batch)})')
             
-        except Exception as e:
-            logger.error(f"Error processing received DMX data for universe {universe}: {e}")
+            self.update_stats()
+        finally:
+            self._flushing = False
     
-    def update_universe_display(self, universe: int):
-        """Update the UI for a specific universe"""
+    def invalidate_display(self):
+        """Forget what the browser shows and redraw every universe with the next refresh.
+
+        The cells are changed in the browser only, the server side elements keep their initial text,
+        so a re-render or a newly connected client starts from the initial values again.
+        """
+        self._last_vals = [np.full(self.n_channels, -1, dtype=np.int16) for _ in range(self._u_count)]
+        with self._rx_lock:
+            self._rx_dirty = (1 << len(self.universe_data)) - 1
+
+    def update_universe_display(self, universe: int, data: np.ndarray, batch: list):
+        """Collect the cell updates of a specific universe as [cell_id, style, text] into batch"""
         try:
-            if universe not in self.channel_elements:
+            idx = universe - self._u_base
+            if not 0 <= idx < self._u_count:
                 return
             
-            data = self.universe_data.get(universe, [])
-            elements = self.channel_elements[universe]
+            elements = self.channel_elements[idx]
+            n = len(elements)
+            start = self.start_channel - 1
             
-            for i, (label, cell) in enumerate(elements):
-                channel_idx = self.start_channel - 1 + i
-                val = data[channel_idx] if channel_idx < len(data) else 0
-                
-                # Update UI elements directly (NiceGUI is thread-safe for these properties)
-                new_text = str(int(val))
-                if label.text != new_text:
-                    label.text = new_text
-                
-                # Color intensity background
-                intensity = val / 255.0
-                bg_val = int(20 + 80 * intensity) # Range 20 to 100
-                cell.style(f'background-color: rgb({bg_val}, {bg_val}, {bg_val + (20 if val > 0 else 0)});')
+            # Channels beyond the universe are shown as 0
+            values = np.zeros(n, dtype=np.int16)
+            window = data[start:start + n]
+            values[:window.size] = window
             
-            # Update global stats roughly
-            if self.packet_counter_label:
-                self.packet_counter_label.text = f"Packets received: {self.packet_count}"
-            if self.last_update_label:
-                self.last_update_label.text = f"Last update: {time.strftime('%H:%M:%S', time.localtime(self.last_update))}"
+            # Only touch the cells whose value changed since the last update
+            changed = np.flatnonzero(values != self._last_vals[idx])
+            if changed.size:
+                # Hoist loop invariants into locals, the loop only does list indexing
+                vals = values.tolist()
+                style_lut, text_lut, append = STYLE_LUT, TEXT_LUT, batch.append
+                for i in changed.tolist():
+                    val = vals[i]
+                    append((elements[i], style_lut[val], text_lut[val]))
+                self._last_vals[idx] = values
                 
         except Exception as e:
             pass # Silent fail on UI race conditions during shutdown or re-render
     
+    def update_stats(self):
+        """Update the packet counter and last update labels"""
+        if self.packet_counter_label:
+            self.packet_counter_label.text = f"Packets received: {self.packet_count}"
+        if self.last_update_label:
+            sec = int(self.last_update)
+            if sec != self._last_ts_sec:
+                self._last_ts_sec = sec
+                self._last_ts_str = time.strftime('%H:%M:%S', time.localtime(sec))
+                self.last_update_label.text = f"Last update: {self._last_ts_str}"
+    
     def start_listening(self):
         """Start ArtNet receiver"""
         try:
@@ -171,23 +279,33 @@ class ArtNetReceiver:
                 self.stop_listening()
                 return
             
-            # Create server
-            self.server = StupidArtnetServer(port=self.listen_port)
-            self.listener_ids = []
+            # Allocate the receive ring before the server thread can deliver packets
+            self._rx_base = self.start_universe
+            self.universe_data = np.zeros((self.n_universes, 512), dtype=np.uint8)
+            self._rx_dirty = 0
+            self._rx_count = 0
+            self._seen_count = 0
+            
+            # Create server, it reads packets in batches and dispatches all universes in range to a single callback
+            self.server = ArtNetInput(
+                port=self.listen_port,
+                start_universe=self.start_universe,
+                n_universes=self.n_universes,
+                callback=self.on_dmx_received,
+                bind_address='' if self.listen_ip == '0.0.0.0' else self.listen_ip,
+            )
+            granted_buffer = self.enlarge_receive_buffer()
             
-            # Register listeners for all universes in range
-            for u in range(self.start_universe, self.start_universe + self.n_universes):
-                # We need to capture the universe ID in the lambda
-                l_id = self.server.register_listener(
-                    universe=u,
-                    callback_function=lambda data, u_id=u: self.on_dmx_received(data, u_id)
-                )
-                self.listener_ids.append(l_id)
+            if self.cpu_core >= 0:
+                self.pin_receive_thread()
             
             self.is_listening = True
             
             # Update UI
-            self.update_status(f"Listening on {self.n_universes} Universes ({self.start_universe}-{self.start_universe + self.n_universes - 1}) on port {self.listen_port}", error=False)
+            status = f"Listening on {self.n_universes} Universes ({self.start_universe}-{self.start_universe + self.n_universes - 1}) on port {self.listen_port}"
+            if granted_buffer is not None and granted_buffer < RECEIVE_BUFFER_SIZE and sys.platform.startswith('linux'):
+                status += f" (receive buffer only {granted_buffer // 1024} KiB, raise net.core.rmem_max and net.core.netdev_max_backlog=5000)"
+            self.update_status(status, error=False)
             self.listen_button.props('color=negative icon=stop')
             self.listen_button.text = 'Stop'
             
@@ -198,6 +316,48 @@ class ArtNetReceiver:
             self.update_status(f"Failed to start: {e}", error=True)
             self.is_listening = False
     
+    def pin_receive_thread(self):
+        """Pin the server receive thread to its own CPU core and raise it to real-time priority (Linux only)"""
+        tid = self.server.thread.native_id
+        if tid is None or not hasattr(os, 'sched_setaffinity'):
+            logger.warning("Pinning the receive thread is not supported on this platform")
+            return
+        
+        try:
+            os.sched_setaffinity(tid, {self.cpu_core})
+            logger.info(f"Pinned ArtNet receive thread to CPU {self.cpu_core}")
+        except OSError as e:
+            logger.warning(f"Failed to pin receive thread to CPU {self.cpu_core}: {e}")
+            return
+        
+        try:
+            os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(RECEIVE_THREAD_PRIORITY))
+        except PermissionError:
+            logger.warning("Real-time priority for the receive thread requires CAP_SYS_NICE, keeping default scheduling")
+        except OSError as e:
+            logger.warning(f"Failed to set receive thread scheduling: {e}")
+    
+    def enlarge_receive_buffer(self) -> int | None:
+        """Enlarge the receive buffer of the server socket so packet bursts are not dropped.
+
+        Returns the buffer size granted by the OS or None if it could not be set.
+        """
+        sock = self.server.socket
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE)
+            granted = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        except OSError as e:
+            logger.warning(f"Failed to set socket receive buffer: {e}")
+            return None
+
+        # Linux reports the doubled value and caps the request at net.core.rmem_max
+        if granted < RECEIVE_BUFFER_SIZE:
+            logger.warning(f"Socket receive buffer limited to {granted} bytes (requested {RECEIVE_BUFFER_SIZE}). "
+                           "Raise net.core.rmem_max and net.core.netdev_max_backlog to avoid dropped packets.")
+        else:
+            logger.info(f"Socket receive buffer set to {granted} bytes")
+        return granted
+
     def stop_listening(self):
         """Stop ArtNet receiver"""
         try:
@@ -207,7 +367,6 @@ class ArtNetReceiver:
                 self.server = None
             
             self.is_listening = False
-            self.listener_ids = []
             
             # Update UI
             self.update_status("Not listening", error=False)
@@ -231,7 +390,10 @@ class ArtNetReceiver:
     @ui.refreshable
     def render_channels(self):
         """Render the channel displays as a table (Grid)"""
-        self.channel_elements = {}
+        self._u_base = self.start_universe
+        self._u_count = self.n_universes
+        self.channel_elements = [[] for _ in range(self.n_universes)]
+        self.invalidate_display()
         
         # Calculate columns: Universe label + n_channels
         cols = self.n_channels + 1
@@ -249,16 +411,16 @@ class ArtNetReceiver:
                     for u in range(self.start_universe, self.start_universe + self.n_universes):
                         ui.label(f'{u}').classes('font-bold text-center self-center text-xs text-gray-300')
                         
-                        self.channel_elements[u] = []
                         for i in range(self.n_channels):
                             with ui.element('div').classes('flex items-center justify-center h-6 rounded text-[10px] font-mono text-white bg-gray-800 transition-colors') as cell:
-                                label = ui.label('0').style('pointer-events: none;')
-                            self.channel_elements[u].append((label, cell))
+                                ui.label('0').style('pointer-events: none;')
+                            self.channel_elements[u - self._u_base].append(cell.id)
 
     def create_ui(self):
         """Create the user interface"""
         # Remove transition animation from progress bars for instant feedback
         ui.add_css('.q-linear-progress__model { transition: none !important; }')
+        ui.add_body_html(APPLY_BATCH_SCRIPT)
         
         ui.label('ArtNet DMX Receiver').classes('text-3xl font-bold mb-4')
         
@@ -294,12 +456,17 @@ class ArtNetReceiver:
             
             # Create channel displays
             self.render_channels()
+        
+        # Refresh the display at a fixed rate instead of on every packet
+        ui.timer(UI_REFRESH_INTERVAL, self.flush_dirty)
+        app.on_connect(self.invalidate_display)
     
-    def shutdown(self):
-        """Clean shutdown"""
+    async def shutdown(self):
+        """Clean shutdown, the receiver is stopped the same way as with the Stop button, the settings are saved off the event loop"""
         logger.info("Shutting down ArtNet receiver...")
-        self.stop_listening()
-        self.settings_manager.save()
+        if self.is_listening:
+            self.stop_listening()
+        await asyncio.to_thread(self.settings_manager.save_to_file)
         logger.info("Shutdown complete")
 
 
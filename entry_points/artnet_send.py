@@ -4,9 +4,16 @@ ArtNet Sender - Send DMX channels via ArtNet
 This application provides a UI to control DMX channels and send them to an ArtNet node.
 """
 import logging
-from led_wall.MultiUniverseArtnet import StupidArtnet
+import os
+import socket
+import sys
+import threading
+import time
+from functools import partial
+import numpy as np
 from nicegui import ui, app
 
+from led_wall.artnet_output import ARTDMX_HEADER_SIZE, make_artdmx_packet
 from led_wall.ui.dmx_channels import DMX_channels_Input
 from led_wall.ui.settings_manager import SettingsElement, SettingsManager
 
@@ -14,8 +21,26 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 #logger.setLevel(logging.DEBUG)  # Set to DEBUG for more detailed output
 
+ARTNET_PORT = 6454
+SO_MAX_PACING_RATE = getattr(socket, 'SO_MAX_PACING_RATE', 47)  # Linux only, not exported by every Python build
+SEND_PRIORITY = 6  # SO_PRIORITY for the ArtNet socket, 6 is the highest value without CAP_NET_ADMIN
+KEEPALIVE_INTERVAL = 1.0  # seconds, unchanged frames are still resent this often so late joining nodes recover
+SENDER_THREAD_PRIORITY = 20  # SCHED_FIFO priority of the sender thread (Linux only, best effort)
+
+# the status label only ever carries one of these classes, they are swapped in one step
+STATUS_OK = 'text-green-500'
+STATUS_ERROR = 'text-red-500'
+STATUS_IDLE = 'text-gray-500'
+
 
 class ArtNetSender:
+    __slots__ = (
+        'settings_manager', 'artnet_ip', 'universe', 'start_channel', 'fps', 'n_channels',
+        'is_sending', 'dmx_inputs', 'status_label', 'connect_button', 'settings_elements',
+        '_socket', '_packets', '_payloads', '_span', '_front', '_version', '_packet_lock', '_np_scratch',
+        '_status', '_sender_thread',
+    )
+
     def __init__(self):
         # Settings manager for persistence
         self.settings_manager = SettingsManager(path='artnet_send_settings.json')
@@ -29,9 +54,20 @@ class ArtNetSender:
         # Number of DMX channels to control
         self.n_channels = 10
         
-        # StupidArtnet instance
-        self.artnet = None
+        # UDP socket to the ArtNet node
+        self._socket = None
         self.is_sending = False
+
+        # Two preallocated ArtDmx packets, _emit_packet writes the back one in place and hands it over by index,
+        # the sender thread only ever sends the front one (see _build_packets)
+        self._packet_lock = threading.Lock()
+        self._version = 0  # bumped on every hand over
+        self._build_packets()  # rebuilt whenever start_channel or n_channels change the used channel span
+        self._np_scratch = np.empty(self.n_channels, dtype=np.uint8)
+
+        # sender thread at fps, status messages it posts are applied on the UI loop by _apply_status
+        self._sender_thread = None
+        self._status: tuple[str, bool] | None = None
         
         # DMX channels input handler
         self.dmx_inputs = DMX_channels_Input(
@@ -50,7 +86,7 @@ class ArtNetSender:
                 input=ui.input,
                 settings_id='artnet_ip',
                 default_value=self.artnet_ip,
-                on_change=lambda e: setattr(self, 'artnet_ip', e.value),
+                on_change=partial(self._set_value, 'artnet_ip'),
                 manager=self.settings_manager,
                 placeholder='e.g., 192.168.1.100'
             ),
@@ -59,7 +95,7 @@ class ArtNetSender:
                 input=ui.number,
                 settings_id='universe',
                 default_value=self.universe,
-                on_change=lambda e: setattr(self, 'universe', int(e.value) if e.value is not None else 0),
+                on_change=partial(self._set_int, 'universe', 0),
                 manager=self.settings_manager,
                 precision=0,
                 min=0,
@@ -70,7 +106,7 @@ class ArtNetSender:
                 input=ui.number,
                 settings_id='start_channel',
                 default_value=self.start_channel,
-                on_change=lambda e: setattr(self, 'start_channel', int(e.value) if e.value is not None else 1),
+                on_change=partial(self._set_int, 'start_channel', 1),
                 manager=self.settings_manager,
                 precision=0,
                 min=1,
@@ -81,39 +117,114 @@ class ArtNetSender:
                 input=ui.number,
                 settings_id='fps',
                 default_value=self.fps,
-                on_change=lambda e: setattr(self, 'fps', int(e.value) if e.value is not None else 30),
+                on_change=partial(self._set_int, 'fps', 30),
                 manager=self.settings_manager,
                 precision=0,
                 min=1,
                 max=60
             ),
         ]
+
+    def _set_value(self, name: str, event):
+        """Settings on_change handler storing the value in attribute name"""
+        setattr(self, name, event.value)
+    
+    def _set_int(self, name: str, default: int, event):
+        """Settings on_change handler storing the value as int in attribute name, default if cleared"""
+        setattr(self, name, int(event.value) if event.value is not None else default)
     
     def on_dmx_change(self, event):
-        """Called when DMX channel values change"""
-        if self.is_sending and self.artnet:
+        """Called when DMX channel values change, posts the new frame to the sender thread"""
+        self._emit_packet()
+
+    def _channel_span(self) -> tuple[int, int]:
+        """Start channel and payload size the packets need, only up to the last channel we control (rounded up to an even size)"""
+        return self.start_channel, min(512, max(2, (self.start_channel - 1 + self.n_channels + 1) & ~1))
+
+    def _build_packets(self):
+        """Allocate the two zeroed ArtDmx packets for the current channel span"""
+        span = self._channel_span()
+        with self._packet_lock:
+            self._packets = [make_artdmx_packet(self.universe, span[1]) for _ in range(2)]
+            self._payloads = [memoryview(packet)[ARTDMX_HEADER_SIZE:] for packet in self._packets]
+            self._span = span
+            self._front = 0  # index of the packet the sender thread sends
+            self._version += 1  # the new packets are sent on the next tick
+
+    def _sender_loop(self):
+        """Send the front packet at self.fps, runs on its own thread while connected"""
+        self._set_realtime_priority()
+        last_version = -1
+        last_send = 0.0
+        next_frame = time.perf_counter()
+        while self.is_sending:
+            now = time.monotonic()
+            # unchanged frames are only resent as keepalive
+            if self._version != last_version or now - last_send >= KEEPALIVE_INTERVAL:
+                # the lock keeps _emit_packet from writing into the packet while it is sent
+                with self._packet_lock:
+                    last_version = self._version
+                    self._send(self._packets[self._front])
+                last_send = now
+
+            next_frame += 1 / self.fps
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.perf_counter()  # fell behind, don't try to catch up with a burst
+
+    def _set_realtime_priority(self):
+        """Run the calling thread with SCHED_FIFO so UI work and GC pauses don't delay frames"""
+        if not hasattr(os, 'sched_setscheduler'):
+            return
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(SENDER_THREAD_PRIORITY))
+        except OSError as e:
+            logger.warning(f"Could not set real-time priority for the ArtNet sender thread: {e}")
+
+    def _emit_packet(self):
+        """Write the current channel values into the back packet and hand it over to the sender thread"""
+        if self.is_sending and self._socket:
             try:
-                # Get channel values
-                channels = self.dmx_inputs.get_channels()
-                
-                # Create DMX packet (512 channels, initialize with 0)
-                dmx_packet = [0] * 512
-                
-                # Fill in our channel values starting at start_channel
-                for i, value in enumerate(channels):
-                    channel_index = self.start_channel - 1 + i
-                    if channel_index < 512:
-                        dmx_packet[channel_index] = int(value)
-                
-                # Set the packet and send
-                self.artnet.set(dmx_packet)
-                self.artnet.show() # Disabled explicitly because start() handles it
+                # Get channel values, clipped into the preallocated scratch array
+                channels = self.dmx_inputs.get_channels_np()
+                vals = np.clip(channels, 0, 255, out=self._np_scratch, casting='unsafe')
+
+                # start_channel or the channel count changed since the packets were built
+                if self._span != self._channel_span():
+                    self._build_packets()
+
+                # Write our channels into the back packet starting at start_channel
+                front = self._front
+                payloads = self._payloads
+                start = self.start_channel - 1
+                end = min(start + len(vals), len(payloads[front]))
+                if end <= start:
+                    self.update_status(f"Error: start channel {self.start_channel} is outside the universe", error=True)
+                    return
+                data = memoryview(vals)[:end - start]
+                if payloads[front][start:end] == data:
+                    return  # nothing changed since the last hand over
+                payloads[front ^ 1][start:end] = data  # the sender thread never reads the back packet
+                with self._packet_lock:
+                    self._front = front ^ 1
+                    self._version += 1
                 
                 logger.debug(f"Sent DMX data: {channels}")
             except Exception as e:
                 logger.error(f"Error sending ArtNet data: {e}")
                 self.update_status(f"Error: {e}", error=True)
     
+    def _send(self, packet):
+        """Send one packet on the connected socket"""
+        try:
+            if self._socket:
+                self._socket.send(packet)
+        except Exception as e:
+            logger.error(f"Error sending ArtNet data: {e}")
+            self._status = (f"Error: {e}", True)  # runs on the sender thread, applied by _apply_status
+
     def connect_artnet(self):
         """Initialize ArtNet connection"""
         try:
@@ -127,20 +238,16 @@ class ArtNetSender:
                 self.update_status("Error: Please enter an ArtNet server IP", error=True)
                 return
             
-            # Create StupidArtnet instance
-            # stupidArtnet takes: target_ip, universes, packet_size, fps, even_packet_size, broadcast
-            self.artnet = StupidArtnet(
-                target_ip=self.artnet_ip,
-                universes=[self.universe],
-                packet_size=512,  # Standard DMX packet size
-                fps=self.fps,
-                even_packet_size=True,
-                broadcast=False
-            )
+            # Open a connected UDP socket, only the sender thread sends on it
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.connect((self.artnet_ip, ARTNET_PORT))
+            self._build_packets()
+            self.apply_pacing()
             
             # Start sending
-            #self.artnet.start()
             self.is_sending = True
+            self._sender_thread = threading.Thread(target=self._sender_loop, name="ArtNetSender", daemon=True)
+            self._sender_thread.start()
             
             # Update UI
             self.update_status(f"Connected to {self.artnet_ip} (Universe {self.universe})", error=False)
@@ -157,14 +264,31 @@ class ArtNetSender:
             self.update_status(f"Connection failed: {e}", error=True)
             self.is_sending = False
     
+    def apply_pacing(self):
+        """Let the kernel space packets at fps instead of relying on the sleep in the sender thread.
+
+        Linux only, pacing is enforced by the fq qdisc which has to be enabled on the
+        outgoing interface: tc qdisc add dev <nic> root fq
+        """
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            self._socket.setsockopt(socket.SOL_SOCKET, SO_MAX_PACING_RATE, self.fps * len(self._packets[0]))
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, SEND_PRIORITY)
+        except OSError as e:
+            logger.warning(f"Could not enable ArtNet send pacing: {e}")
+
     def disconnect_artnet(self):
         """Stop ArtNet transmission"""
         try:
-            if self.artnet:
-                self.artnet.stop()
-                self.artnet = None
-            
             self.is_sending = False
+            if self._sender_thread:
+                self._sender_thread.join(timeout=1.0)
+                self._sender_thread = None
+
+            if self._socket:
+                self._socket.close()
+                self._socket = None
             
             # Update UI
             self.update_status("Disconnected", error=False)
@@ -177,13 +301,17 @@ class ArtNetSender:
             logger.error(f"Error disconnecting: {e}")
     
     def update_status(self, message: str, error: bool = False):
-        """Update status label"""
+        """Update status label, UI loop only"""
         if self.status_label:
             self.status_label.text = message
-            if error:
-                self.status_label.classes('text-red-500', remove='text-green-500 text-gray-500')
-            else:
-                self.status_label.classes('text-green-500', remove='text-red-500 text-gray-500')
+            self.status_label.classes(replace=STATUS_ERROR if error else STATUS_OK)
+
+    def _apply_status(self):
+        """Apply the status posted by the sender thread, called by a UI timer"""
+        status = self._status
+        if status is not None:
+            self._status = None
+            self.update_status(*status)
     
     def create_ui(self):
         """Create the user interface"""
@@ -205,7 +333,8 @@ class ArtNetSender:
                     icon='cast'
                 ).props('color=positive')
                 
-                self.status_label = ui.label('Not connected').classes('text-gray-500')
+                self.status_label = ui.label('Not connected').classes(STATUS_IDLE)
+                ui.timer(0.2, self._apply_status)
         
         ui.separator()
         
@@ -1,16 +1,17 @@
-
 import time
 
 from led_wall.PyDMX import PyDMX
 
+FPS = 44 # DMX512 needs ~44 Hz refresh to look stable
+
 dmx = PyDMX('COM5')
 
+# start code + 512 channels, mutated in place and sent once per cycle
+frame = bytearray(513)
+frame[1] = 255
+#frame[4] = 255
+
 
 while True:
-    dmx.set_data(1,255) 
-    dmx.set_data(2,0) 
-    dmx.set_data(3,0) 
-    #dmx.set_data(4,255) 
-    dmx.set_data(5,0) 
-    dmx.send() #takes 250ms
-    time.sleep(1)  # Sleep for 1 second
\ No newline at end of file
+    dmx.set_frame(frame)
+    time.sleep(1 / FPS)
@@ -5,9 +5,10 @@ import asyncio
 import logging
 import multiprocessing
 import socket
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from led_wall.ui.logging_config import getLogger
-from led_wall.effects.effect_manager import EffectManager
 from led_wall.ui.dmx_channels import DMX_channels_Input
 from led_wall.ui.settings_manager import SettingsElement, SettingsManager
 from led_wall.io_manager import IO_Manager, get_local_ip
@@ -16,9 +17,25 @@ from dotenv import load_dotenv
 from multiprocessing import freeze_support
 from nicegui import app, ui
 
+if TYPE_CHECKING:
+    # imported lazily in apply_preset, the effects pull in opencv and all effect modules
+    from led_wall.effects.effect_manager import EffectManager
+
+
+@dataclass(slots=True)
+class AppState:
+    """Objects shared between the UI callbacks, replaces module globals."""
+    io_manager: IO_Manager | None = None
+    effect_manager: "EffectManager | None" = None
 
 
 load_dotenv()  # Load environment variables from .env file
+
+try:
+    import uvloop  # optional, not available on Windows
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 logger = getLogger("main")
 
 user_data_dir = os.getenv("APPDATA") or os.path.expanduser("~/.config")  # Use APPDATA on Windows, otherwise use ~/.config
@@ -37,7 +54,6 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
 
     initialized = False
     from nicegui import ui, app, Client, core
-    from nicegui.events import ValueChangeEventArguments
 
     # from led_wall.ui.translate import setup_translate
     # _ = setup_translate() #lazy translate function
@@ -53,7 +69,9 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
     if "selected_preset" not in app_settings.settings:
         app_settings.settings["selected_preset"] = "Show1"
 
-    presets = [key for key in settings_manager.settings["presets"]]
+    #shared node for all presets, every preset gets a child manager of this one
+    presets_mgr = SettingsManager(parent=settings_manager, name="presets")
+    presets = list(presets_mgr.settings)
 
 
     #handle all Input & Outputs
@@ -65,11 +83,13 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
         os.makedirs(media_dir)
     app.add_static_files('/media', media_dir)
 
-    effect_manager = None
+    state = AppState(io_manager=io_manager)
+    _effect_mgr_cache: dict[str, "EffectManager"] = {}  # one effect manager per preset, reused when switching back
 
     #define main window ui
     @ui.refreshable
-    def main_window(effect_manager:EffectManager):
+    def main_window(state: AppState):
+        effect_manager = state.effect_manager
         if effect_manager:
             with ui.row().classes('w-full flex flex-wrap gap-4'):
                 with ui.element("div").classes('w-full md:w-1/4 min-w-[200px]'):
@@ -90,58 +110,74 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
     #     effect_manager.effect_setting_ui()
 
     @ui.refreshable
-    def show_ui(effect_manager, io_manager):
+    def show_ui(state: AppState):
         ui.label("DMX channels").classes('text-1xl font-bold mb-4')
-        io_manager.dmx_channel_ui()  # Create the settings UI for DMX inputs
+        state.io_manager.dmx_channel_ui()  # Create the settings UI for DMX inputs
 
-    def preset_change(e) -> None:
-        global effect_manager, io_manager
+    def apply_preset(value: str) -> None:
+        """Switch to the preset with the given name, it is created if it does not exist yet."""
+        effect_manager = state.effect_manager
 
         #check if it is the same preset, if so do nothing
-        if e.value == app_settings.settings["selected_preset"] and effect_manager is not None:
+        if value == app_settings.settings["selected_preset"] and effect_manager is not None:
             return
 
-        if e.value not in settings_manager.settings["presets"]: #if it does not exist add it
-            presets.append(e.value)
-            settings_manager.settings["presets"][e.value] = {}
+        if value not in presets_mgr.settings: #if it does not exist add it
+            if value not in presets: #ui.select in add-unique mode already appended it to the shared options list
+                presets.append(value)
+            presets_mgr.settings[value] = {}
             settings_manager.save_with_timeout()
         
-        logger.info(f"Preset changed to {e.value}")
+        logger.info(f"Preset changed to {value}")
 
         if effect_manager:
-            effect_manager.shutdown()  # Stop all effects and cleanup resources before creating a new effect manager
-
-        #create a new effect manager with the new preset settings
-        effect_settings = SettingsManager(parent=SettingsManager(parent=settings_manager, name="presets"), name=e.value)
-        effect_manager = EffectManager(IO_manager=io_manager, settings_manager=effect_settings)
-        effect_manager.setup()  # Setup the effect manager with the new preset settings
-
-        main_window.refresh(effect_manager)  # Refresh the main window to show the new effects
+            effect_manager.suspend()  # Stop the effects and the loop, the manager is kept for when the preset is selected again
+
+        effect_manager = _effect_mgr_cache.get(value)
+        if effect_manager is None:
+            #create a new effect manager with the new preset settings
+            from led_wall.effects.effect_manager import EffectManager  # imported on first use, it pulls in all effects
+            effect_settings = presets_mgr.child(value)
+            effect_manager = EffectManager(IO_manager=state.io_manager, settings_manager=effect_settings)
+            effect_manager.setup()  # Setup the effect manager with the new preset settings
+            _effect_mgr_cache[value] = effect_manager
+        else:
+            effect_manager.resume()
+        state.effect_manager = effect_manager
+
+        main_window.refresh(state)  # Refresh the main window to show the new effects
         #effect_settings_ui.refresh(effect_manager)
-        show_ui.refresh(effect_manager,io_manager)
+        # show_ui only renders the DMX channels of the io_manager, which is the same for every preset, so it is not rebuilt
 
         effect_manager.setup_preview()  # Setup the preview before the UI is fully up
         effect_manager.IO_manager.start_loop()
 
-    # Flag to prevent multiple shutdowns
-    _shutdown_in_progress = False
+    def preset_change(e) -> None:
+        apply_preset(e.value)
+
+    # Set once shutdown has started, prevents multiple shutdowns
+    _shutdown = asyncio.Event()
 
     async def disconnect_all_clients():
-        """Disconnect all clients from the server."""
-        for client_id in list(Client.instances.keys()):
-            try:
-                await core.sio.disconnect(client_id)
-            except Exception as e:
-                logger.error(f"Error disconnecting client {client_id}: {e}")
+        """Disconnect all clients from the server concurrently."""
+        client_ids = tuple(Client.instances)
+        results = await asyncio.gather(*(core.sio.disconnect(client_id) for client_id in client_ids), return_exceptions=True)
+        for client_id, result in zip(client_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error disconnecting client {client_id}: {result}")
+
+    def effect_managers() -> list["EffectManager"]:
+        """The active effect manager and the suspended ones of other presets, each once."""
+        managers = [state.effect_manager] if state.effect_manager else []
+        managers += [m for m in _effect_mgr_cache.values() if m is not state.effect_manager]
+        return managers
 
     async def async_shutdown():
         """Async shutdown called by app.on_shutdown — runs BEFORE NiceGUI tears down background tasks."""
-        global _shutdown_in_progress
-
-        if _shutdown_in_progress:
+        if _shutdown.is_set():
             return
 
-        _shutdown_in_progress = True
+        _shutdown.set()
         logger.info("Shutting down...")
 
         # Disconnect all NiceGUI clients
@@ -151,12 +187,15 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
         except Exception as e:
             logger.error(f"Error disconnecting clients: {e}")
 
-        # Run blocking effect_manager.shutdown() in a thread so it doesn't
-        # block the event loop (it internally calls thread.join(timeout=2.0))
-        if effect_manager:
-            loop = asyncio.get_running_loop()
+        # Run the blocking shutdowns in a thread so they don't
+        # block the event loop (stop_loop internally calls thread.join(timeout=2.0))
+        # the IO loop is shared by all presets, it is stopped once before the effects
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, io_manager.stop_loop)
+        logger.info("IO manager loop stopped")
+        for effect_manager in effect_managers():
             await loop.run_in_executor(None, effect_manager.shutdown)
-            logger.info("Effect manager shutdown complete")
+        logger.info("Effect manager shutdown complete")
 
         logger.info("Shutdown complete")
 
@@ -169,13 +208,35 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
             app.shutdown()
         except RuntimeError:
             # No running loop — fall back to synchronous cleanup
-            if effect_manager:
+            io_manager.stop_loop()
+            for effect_manager in effect_managers():
                 effect_manager.shutdown()
             sys.exit(0)
 
-    # Register signal handler for clean shutdown
-    signal.signal(signal.SIGINT, shutdown_signal_handler)
-    signal.signal(signal.SIGTERM, shutdown_signal_handler)
+    # Register signal handler for clean shutdown, only when run as the app and not when imported
+    if __name__ in {"__main__", "__mp_main__"}:
+        signal.signal(signal.SIGINT, shutdown_signal_handler)
+        signal.signal(signal.SIGTERM, shutdown_signal_handler)
+
+    _signal_tasks: set[asyncio.Task] = set()  # keeps the shutdown task referenced until it is done
+
+    async def signal_shutdown():
+        """Clean up (clients, effects, IO loop) first, then let NiceGUI stop the server."""
+        await async_shutdown()
+        app.shutdown()
+
+    def on_loop_signal():
+        task = asyncio.create_task(signal_shutdown())
+        _signal_tasks.add(task)
+        task.add_done_callback(_signal_tasks.discard)
+
+    def install_loop_signal_handlers():
+        """On unix let the event loop deliver SIGINT/SIGTERM, the shutdown then runs as a normal loop callback."""
+        if sys.platform == 'win32' or __name__ not in {"__main__", "__mp_main__"}:
+            return # add_signal_handler is not available on Windows, keep the signal.signal handlers
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, on_loop_signal)
 
     if app_settings.settings["selected_preset"] not in presets:
         #should never happen maybe manual edits to settings file
@@ -206,7 +267,7 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
         
 
     #main window structuring
-    main_window(effect_manager)
+    main_window(state)
 
     with ui.tabs().classes('w-full') as tabs:
         tab_show = ui.tab('Show')
@@ -214,7 +275,7 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
 
     with ui.tab_panels(tabs, value=tab_show).classes('w-full'):
         with ui.tab_panel(tab_show):
-            show_ui(effect_manager,io_manager)
+            show_ui(state)
         with ui.tab_panel(tab_setting):
             # ui.label('Effekt Einstellungen').classes('text-1xl font-bold mb-4')
             # effect_settings_ui(effect_manager)
@@ -241,18 +302,21 @@ if (not DEV or __name__ != "__main__") and multiprocessing.current_process().nam
     #     print("Here are some tasks you want to run before every page load")
     #     ui.label("You page definitions go here")
 
+    LOCAL_IP = get_local_ip()
+
     with ui.footer().classes('bg-transparent text-gray-500 flex justify-between items-center px-4 py-1'):
         ui.label('Created by Lorin Mühlebach').classes('text-xs font-light')
-        ui.label(f'Server: {get_local_ip()}:{port}').classes('text-xs font-light')
+        ui.label(f'Server: {LOCAL_IP}:{port}').classes('text-xs font-light')
 
     def delayed_startup_tasks():
         #print("Here are a bunch of startup tasks that also must be run once, but can be after the server has started")
         #io_manager.start_loop()  # Start the IO manager loop before the UI is fully up
         #effect_manager.setup()
-        preset_change(ValueChangeEventArguments(sender=None, client=None, value=app_settings.settings["selected_preset"]))  # Trigger the preset change to initialize everything
+        apply_preset(app_settings.settings["selected_preset"])  # Trigger the preset change to initialize everything
         preset_settinsElement.on_change = preset_change  # Set the on_change callback for the preset settings element
         #print("After-server-start startup tasks are done")
 
+    app.on_startup(install_loop_signal_handlers)
     app.on_startup(delayed_startup_tasks)
     app.on_shutdown(async_shutdown)  # Ensure cleanup runs on NiceGUI's own shutdown path too
 
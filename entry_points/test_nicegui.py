@@ -1,3 +1,4 @@
+import asyncio
 from threading import Thread
 import time
 from nicegui import ui
@@ -20,6 +21,7 @@ available_modules = [
 ]
 
 RGBW = True  # True for RGBW, False for RGB
+REFRESH_DELAY = 0.016  # seconds, slider events within one UI frame are merged into a single refresh
 
 #color = "#000000"  # Default color, can be set dynamically
 
@@ -46,17 +48,37 @@ with ui.row().classes('flex w-full'):
                 current_color = Color("#000000")  # Example color, can be set dynamically
                 color_preview = None
                 color_sliders = []
+                refresh_handle: asyncio.TimerHandle | None = None
+                preview_dirty = False
+
+                def flush_refresh() -> None:
+                    """Write the accumulated color to the preview and refresh once"""
+                    global refresh_handle, preview_dirty
+                    refresh_handle = None
+                    hex_color = current_color.as_hex()
+                    if preview_dirty:
+                        preview_dirty = False
+                        color_preview.value = hex_color
+                    dynamically_add_element.refresh(hex_color)
+
+                def schedule_refresh() -> None:
+                    """Restart the trailing refresh timer"""
+                    global refresh_handle
+                    if refresh_handle is not None:
+                        refresh_handle.cancel()
+                    refresh_handle = asyncio.get_running_loop().call_later(REFRESH_DELAY, flush_refresh)
 
                 def set_color(channel:int=None, value:int = None, hex_color: str = None,event=None) -> None:
+                    global preview_dirty
                     if channel is not None and value is not None:
                         current_color.change_single_channel(channel, value)
-                        color_preview.value = current_color.as_hex()
+                        preview_dirty = True
                     elif hex_color is not None:
                         current_color.set_hex(hex_color)
                         for i, slider in enumerate(color_sliders):
                             slider.value = current_color.get_channel_value(i)
 
-                    dynamically_add_element.refresh(current_color.as_hex())
+                    schedule_refresh()
 
                 color_preview = ui.color_input(
                     label='Farbe',
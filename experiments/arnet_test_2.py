@@ -1,6 +1,8 @@
 import asyncio
-from pyartnet import ArtNetNode
+import itertools
+import socket
 
+from led_wall.artnet_output import ARTDMX_HEADER_SIZE, BatchSender, make_artdmx_packet
 from led_wall.pixels import LedPixelArray, LedPixel
 
 
@@ -9,35 +11,45 @@ def gamma(val: float, max_val: int = 0xFF) -> float:
     gamma_value = 2 # 2.2
     return min((val ** gamma_value) / max_val,255)  # Ensure the value does not exceed 255
 
-async def update_loop(PixelArray:list[LedPixelArray]=None):
-    # Run this code in your async function
-    node = ArtNetNode('192.168.178.100', 6454)
+TARGET = ('192.168.178.100', 6454)
 
-    # Create universe 0
-    universes = []
-    channels = []
+async def update_loop(PixelArray:list[LedPixelArray]=None):
+    # one connected UDP socket for all universes, every tick is sent as one batch
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(TARGET)
+    sender = BatchSender(sock)
+
+    # prebuilt packet per universe, the pixel buffer is copied straight into the payload
+    packets = []
+    payload_end = []
     for i in range(len(PixelArray)):
-        universes.append(node.add_universe(i))
-        #universes[i].set_output_correction(gamma)
-
-        #setup pixel arrays
         pixel_length = PixelArray[i].channels_per_pixel()
         num_pixels = len(PixelArray[i])
 
-        channels.append(universes[i].add_channel(start=1, width=pixel_length*num_pixels))
+        size = pixel_length*num_pixels
+        packets.append(make_artdmx_packet(i, size + size % 2))  # ArtDmx payloads have an even length
+        payload_end.append(ARTDMX_HEADER_SIZE + pixel_length*num_pixels)
 
-    fade = 0
-    
-    while True:
-        set_all_same(PixelArray,2,0,0,0)
-        fade = (fade + 2) % 256
+    # loop invariants: (payload view, pixel buffer) per universe and the row of the test pixel
+    copies = [(memoryview(packet)[ARTDMX_HEADER_SIZE:end], array.buffer)
+              for packet, end, array in zip(packets, payload_end, PixelArray)]
+    test_pixel = PixelArray[0].data[100]
+    send = sender.send
+
+    # schedule every frame against an absolute deadline so send jitter does not accumulate
+    period = 1 / 50  # 50 FPS
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
 
-        #at least one pixel need to change such that the channel is updated
+    for n in itertools.count():
+        set_all_same(PixelArray,2,0,0,0)
+        fade = (2 * n) % 256
 
-        PixelArray[0].pixels[100].setColor(0, 0, fade, 0)  # Set pixel 100 to green with fade effect
-        for i in range(len(PixelArray)):
-            channels[i].set_values(PixelArray[i].to_data_list())
-        await asyncio.sleep(0.02)  # 50 FPS
+        test_pixel[:] = (0, 0, fade, 0)  # Set pixel 100 to green with fade effect
+        for payload, buffer in copies:
+            payload[:] = buffer
+        send(packets)
+        await asyncio.sleep(max(0, t0 + (n + 1) * period - loop.time()))
 
 
 PixelArray1 = LedPixelArray(120, order="rgbw")
@@ -55,16 +67,13 @@ PixelArray4.set_all_pixels_color(0, 0, 125, 0)  # Set all pixels to red
 
 def set_all_same(list,r,g,b,w):
     for e in list:
-        e.set_all_pixels_color(r, g, b, w)
+        e.data[:] = (r, g, b, w)
 
 
 def set_all_same_height(list,switch,r,g,b,w,r2,g2,b2,w2):
     for e in list:
-        for i,p in enumerate(e.pixels):
-            if i < switch:
-                p.setColor(r, g, b, w)
-            else:
-                p.setColor(r2, g2, b2, w2)
+        e.data[:switch] = (r, g, b, w)
+        e.data[switch:] = (r2, g2, b2, w2)
 
 async def color_update(PixelArray:LedPixelArray=None):
     last_color = 0  # Initial color
@@ -89,4 +98,10 @@ async def main():
         #color_update(PixelArray2)
     )
 
+try:
+    import uvloop  # optional, not available on Windows
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 asyncio.run(main())
\ No newline at end of file
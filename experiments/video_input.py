@@ -15,13 +15,21 @@ import numpy as np
 # import the necessary packages
 from deffcode import FFdecoder
 import cv2
+import sys
 import time
+import argparse
 import pathlib
+import queue
+import threading
 
 OUTPUT_FRAMERATE = 60  # Set the desired output frame rate
 RESOLUTION = (35*2,80)  # Set the resolution to 80x35
 FILE = pathlib.Path(__file__).parent / "BigBuckBunny_320x180.mp4"
 
+parser = argparse.ArgumentParser(description="Decode a video into RGBW frames for the LED wall")
+parser.add_argument("--preview", action="store_true", help="show the output in a window, quit with 'q' in the window")
+args = parser.parse_args()
+
 ffparams = {"-filter:v":f"fps={OUTPUT_FRAMERATE}",
             "-custom_resolution": RESOLUTION # Set custom resolution to 35x80,
             }  # Example parameter to set frame rate to 10 FPS
@@ -32,25 +40,46 @@ decoder = FFdecoder(str(FILE), verbose=True, **ffparams).formulate()
 
 ts_last_frame = 0  # timestamp of the last frame
 
-def ResizeWithAspectRatio(image, width=None, height=None, inter=cv2.INTER_AREA):
-    dim = None
-    (h, w) = image.shape[:2]
-
-    if width is None and height is None:
-        return image
-    if width is None:
-        r = height / float(h)
-        dim = (int(w * r), height)
-    elif height is None:
-        r = width / float(w)
-        dim = (width, int(h * r))
-    else:
-        rW = width / float(w)
-        rH = height / float(h)
-        r = min(rW, rH)
-        dim = (int(w * r), int(h * r))
-
-    return cv2.resize(image, dim, interpolation=inter)
+# the decoder output size is fixed by -custom_resolution (width, height), so the preview size is computed once
+PREVIEW_MAX_SIZE = (1280, 720)
+_preview_scale = min(PREVIEW_MAX_SIZE[0] / RESOLUTION[0], PREVIEW_MAX_SIZE[1] / RESOLUTION[1])
+PREVIEW_DIM = (int(RESOLUTION[0] * _preview_scale), int(RESOLUTION[1] * _preview_scale))
+
+# preview window runs on its own thread so imshow/waitKey never block the decoder loop
+preview_queue = queue.Queue(maxsize=1)
+quit_requested = threading.Event()
+
+def displayer():
+    while True:
+        frame = preview_queue.get()
+        if frame is None:
+            break
+        resize = cv2.resize(frame, PREVIEW_DIM, interpolation=cv2.INTER_AREA)
+        cv2.imshow("Output", resize)
+
+        # check for 'q' key if pressed
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord("q"):
+            quit_requested.set()
+    cv2.destroyAllWindows()
+
+def stdin_reader():
+    """headless mode: quit when a line starting with 'q' is entered"""
+    for line in sys.stdin:
+        if line.strip().lower().startswith("q"):
+            break
+    quit_requested.set()
+
+if args.preview:
+    display_thread = threading.Thread(target=displayer, daemon=True)
+    display_thread.start()
+else:
+    print("running headless, type q + enter to quit")
+    threading.Thread(target=stdin_reader, daemon=True).start()
+
+# RGBW output buffer, allocated once and filled in place every frame
+rgbw = np.empty((RESOLUTION[0], RESOLUTION[1], 4), dtype=np.uint8)
+white = np.empty((RESOLUTION[0], RESOLUTION[1]), dtype=np.uint8)
 
 # grab the BGR24 frames from decoder
 for frame in decoder.generateFrame():
@@ -72,32 +101,40 @@ for frame in decoder.generateFrame():
     # {do something with the frame here}
     
     
-    # Show output window
-    resize = ResizeWithAspectRatio(frame, width=1280, height=720) # Resize by width OR
-
-    cv2.imshow("Output", resize)
+    # Show output window, the frame is dropped if the previous one is not displayed yet
+    if args.preview:
+        try:
+            preview_queue.put_nowait(frame)
+        except queue.Full:
+            pass
 
     # Convert the frame to the desired shape for the LED wall
 
-    frameT = np.transpose(frame, (1, 0, 2)) #needet for H807SA
+    frameT = np.transpose(frame, (1, 0, 2)) #needet for H807SA (a view, no copy)
     #frame_flat = frameT.flatten()  # Flatten the frame to a 1D array
 
-    #add white channel
-    RGBW_frame = np.dstack((frameT, np.zeros((RESOLUTION[0], RESOLUTION[1], 1))))
+    #the common part of the three colors goes to the white LED, the rest stays on the color LEDs
+    np.min(frameT, axis=2, out=white)
+    np.subtract(frameT, white[:, :, None], out=rgbw[:, :, :3])
+    rgbw[:, :, 3] = white
     
-    #flatten to universes
-    RGBW_universes = RGBW_frame.reshape(RESOLUTION[0],RESOLUTION[1]*4)
+    #flatten to universes (a view of the contiguous buffer, no copy)
+    RGBW_universes = rgbw.reshape(RESOLUTION[0],RESOLUTION[1]*4)
 
-    # check for 'q' key if pressed
-    key = cv2.waitKey(1) & 0xFF
-    if key == ord("q"):
+    if quit_requested.is_set():
         break
 
     
 
     
 # close output window
-cv2.destroyAllWindows()
+if args.preview:
+    try:
+        preview_queue.get_nowait() # make room for the stop signal
+    except queue.Empty:
+        pass
+    preview_queue.put(None)
+    display_thread.join(timeout=1)
 
 # terminate the decoder
 decoder.terminate()
\ No newline at end of file
@@ -9,11 +9,21 @@ NOTES
 """
 
 import socket
-import _thread
-from time import sleep, time
-from stupidArtnet.ArtnetUtils import shift_this, put_in_range
+import struct
+import threading
+from time import sleep, perf_counter
+import numpy as np
+from stupidArtnet.ArtnetUtils import put_in_range
+
+from led_wall.artnet_output import BatchSender, make_artdmx_header
 
 MAX_ARTNET_UPDATE_INTERVAL = 0.5  # MAXIMUM interval between updates to make sure the wall gets an update at least every 0.5 seconds even if the data doesn't change (to prevent freezes on the wall)
+SEND_BUFFER_MIN = 1 << 21  # bytes, a full frame of all universes has to fit into the kernel send buffer without blocking (raise net.core.wmem_max on linux to allow it)
+SEND_PRIORITY = 6  # SO_PRIORITY on linux, highest value allowed without CAP_NET_ADMIN
+_PACK_RGB = struct.Struct('BBB').pack_into
+_PACK_U16_BE = struct.Struct('>H').pack_into
+_PACK_U16_LE = struct.Struct('<H').pack_into
+
 PARTIAL_SEND = False  # creates flicker if true but can be used to send only part of the universe (for example for testing purposes or if you have a device that doesn't require full universes)
 
 class StupidArtnet():
@@ -40,7 +50,6 @@ class StupidArtnet():
         # Instance variables
         self.target_ip = target_ip
         self.universes = universes if isinstance(universes, (list, tuple, range)) else [universes]
-        self.sequences = {u: 0 for u in self.universes}
         self.physical = 0
 
         self.subnet = 0
@@ -48,9 +57,8 @@ class StupidArtnet():
         self.net = 0
         self.packet_size = put_in_range(packet_size, 2, 512, even_packet_size)
         
-        self.universe_buffer = {u: bytearray(self.packet_size) for u in self.universes}
-        self.last_sent_buffer = {u: bytearray(self.packet_size) for u in self.universes}
-        self.last_send_time = {u: 0.0 for u in self.universes}
+        self.make_buffers()
+        self.make_universe_state()
         self.port = port  
         # Use provided port or default 6454
         # By default, the server uses port 6454, no need to specify it.
@@ -60,9 +68,18 @@ class StupidArtnet():
         self.make_even = even_packet_size
 
         self.is_simplified = True		# simplify use of universe, net and subnet
+        self.headers = []
+        self.make_headers()
 
         # UDP SOCKET
         self.socket_client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.socket_client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                                          max(SEND_BUFFER_MIN, (18 + self.packet_size) * len(self.universes) * 4))
+            if hasattr(socket, "SO_PRIORITY"):  # linux only
+                self.socket_client.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, SEND_PRIORITY)
+        except OSError as error:
+            print(f"WARNING: could not tune Art-Net socket: {error}")
 
         if broadcast:
             self.socket_client.setsockopt(
@@ -74,9 +91,24 @@ class StupidArtnet():
                 socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.socket_client.bind(source_address)
 
+        # connected socket, all universes of a frame are handed to the kernel in one batch (sendmmsg on linux)
+        # an address that does not resolve raises, any other connect error (e.g. network not up yet at boot)
+        # falls back to an unconnected socket that sends every packet with sendto
+        address = None
+        try:
+            self.socket_client.connect((self.target_ip, self.port))
+        except socket.gaierror:
+            self.socket_client.close()
+            raise
+        except OSError as error:
+            print(f"WARNING: could not connect Art-Net socket to {self.target_ip}:{self.port}, sending unconnected: {error}")
+            address = (self.target_ip, self.port)
+        self.batch_sender = BatchSender(self.socket_client, batch_size=max(len(self.universes), 1), address=address)
+
         # Timer
         self.fps = fps
-        self.__clock = None
+        self.running = False
+        self._thread = None
 
         if self.if_sync:
             self.artsync_header = bytearray()
@@ -106,47 +138,51 @@ class StupidArtnet():
 
     def make_artdmx_header(self, universe):
         """Make packet header."""
-        # 0 - id (7 x bytes + Null)
-        header = bytearray()
-        header.extend(bytearray('Art-Net', 'utf8'))
-        header.append(0x0)
-        # 8 - opcode (2 x 8 low byte first)
-        header.append(0x00)
-        header.append(0x50)  # ArtDmx data packet
-        # 10 - prototocol version (2 x 8 high byte first)
-        header.append(0x0)
-        header.append(14)
-        # 12 - sequence (int 8), NULL for not implemented
-        header.append(self.sequences[universe])
-        # 13 - physical port (int 8)
-        header.append(0x00)
-        # 14 - universe, (2 x 8 low byte first)
-        if self.is_simplified:
-            # not quite correct but good enough for most cases:
-            # the whole net subnet is simplified
-            # by transforming a single uint16 into its 8 bit parts
-            # you will most likely not see any differences in small networks
-            msb, lsb = shift_this(universe)   # convert to MSB / LSB
-            header.append(lsb)
-            header.append(msb)
-        # 14 - universe, subnet (2 x 4 bits each)
-        # 15 - net (7 bit value)
-        else:
-            # as specified in Artnet 4 (remember to set the value manually after):
-            # Bit 3  - 0 = Universe (1-16)
-            # Bit 7  - 4 = Subnet (1-16)
-            # Bit 14 - 8 = Net (1-128)
-            # Bit 15     = 0
-            # this means 16 * 16 * 128 = 32768 universes per port
-            # a subnet is a group of 16 Universes
-            # 16 subnets will make a net, there are 128 of them
-            header.append(self.subnet << 4 | universe)
-            header.append(self.net & 0xFF)
-        # 16 - packet size (2 x 8 high byte first)
-        msb, lsb = shift_this(self.packet_size)		# convert to MSB / LSB
-        header.append(msb)
-        header.append(lsb)
-        return header
+        # not quite correct but good enough for most cases:
+        # the whole net subnet is simplified
+        # by transforming a single uint16 into its 8 bit parts
+        # you will most likely not see any differences in small networks
+        # otherwise as specified in Artnet 4 (remember to set the value manually after):
+        # a subnet is a group of 16 Universes, 16 subnets will make a net, there are 128 of them
+        return make_artdmx_header(universe, self.packet_size,
+                                  sequence=self.sequences[self.universe_index[universe]],
+                                  physical=self.physical,
+                                  subnet=None if self.is_simplified else self.subnet,
+                                  net=self.net)
+
+
+    def make_buffers(self, old_buffer=None):
+        """Allocate one contiguous (universes, packet_size) uint8 array for the DMX data of all universes.
+
+        universe_buffer[u] stays available as a writable memoryview of the universe's row,
+        rows holds the same views by slot for show().
+        If old_buffer is given its content is kept as far as it fits.
+        """
+        self.universe_index = {u: i for i, u in enumerate(self.universes)}
+        self.buffer = np.zeros((len(self.universes), self.packet_size), dtype=np.uint8)
+        if old_buffer is not None and len(old_buffer) == len(self.universes):
+            length = min(old_buffer.shape[1], self.packet_size)
+            self.buffer[:, :length] = old_buffer[:, :length]
+        self.rows = [memoryview(row) for row in self.buffer]
+        self.universe_buffer = dict(zip(self.universes, self.rows))
+
+
+    def make_universe_state(self):
+        """Reset the per universe send state, lists indexed by the slot of the universe in self.universes."""
+        n = len(self.universes)
+        self.sequences = [0] * n
+        # every setter bumps the dirty version of its universe, show() sends when it differs from the sent version
+        self.dirty_version = [1] * n
+        self.sent_version = [0] * n
+        self.last_send_time = [0.0] * n  # perf_counter() time, monotonic
+
+
+    def make_headers(self):
+        """Build the ArtDmx header of every universe, only the sequence byte changes per packet.
+
+        Needs to be called whenever universe, subnet, net, packet size or simplification change.
+        """
+        self.headers = [self.make_artdmx_header(u) for u in self.universes]
 
 
     def make_artsync_header(self):
@@ -171,39 +207,56 @@ class StupidArtnet():
         """Send Artsync"""
         self.make_artsync_header()
         try:
-            self.socket_client.sendto(self.artsync_header, (self.target_ip, self.port))
+            self.batch_sender.send((self.artsync_header,))
         except socket.error as error:
             print(f"ERROR: Socket error with exception: {error}")
 
 
-    def show(self):
-        """Finally send data."""
-        current_time = time()
+    def show(self, now=None):
+        """Finally send data.
+
+        now - perf_counter() timestamp of this frame, taken from the caller's clock if it already has one
+        """
+        current_time = now if now is not None else perf_counter()
+
+        dirty_version = self.dirty_version
+        sent_version = self.sent_version
+        change_in_data = dirty_version != sent_version
 
-        change_in_data = False
-        for u in self.universes:
-            if self.universe_buffer[u] != self.last_sent_buffer[u]:
-                change_in_data = True
-                break
+        last_send_time = self.last_send_time
+        sequences = self.sequences
+        headers = self.headers
+        rows = self.rows
 
-        for u in self.universes:
+        # collect the packets of all universes that need an update and send them in one batch
+        send_slots = []
+        packets = []
+        for i in range(len(rows)):
             # Check if data has changed or if it's been more than a second since the last update
             if (not PARTIAL_SEND and change_in_data)  \
-                    or self.universe_buffer[u] != self.last_sent_buffer[u] \
-                    or (current_time - self.last_send_time[u]) > MAX_ARTNET_UPDATE_INTERVAL:
+                    or dirty_version[i] != sent_version[i] \
+                    or (current_time - last_send_time[i]) > MAX_ARTNET_UPDATE_INTERVAL:
                 
-                header = self.make_artdmx_header(u)
-                packet = bytearray()
-                packet.extend(header)
-                packet.extend(self.universe_buffer[u])
+                header = headers[i]
+                header[12] = sequences[i]
+                send_slots.append(i)
+                packets.append((header, rows[i]))  # header and data are gathered by the sender, no concatenation
+
+        if packets:
+            try:
                 try:
-                    self.socket_client.sendto(packet, (self.target_ip, self.port))
-                    self.last_sent_buffer[u] = bytearray(self.universe_buffer[u])
-                    self.last_send_time[u] = current_time
-                except socket.error as error:
-                    print(f"ERROR: Socket error with exception: {error}")
-                finally:
-                    self.sequences[u] = (self.sequences[u] + 1) % 256
+                    self.batch_sender.send(packets)
+                except ConnectionRefusedError:
+                    # an icmp port unreachable of an earlier packet is reported once on the connected socket, send again
+                    self.batch_sender.send(packets)
+                for i in send_slots:
+                    sent_version[i] = dirty_version[i]
+                    last_send_time[i] = current_time
+            except socket.error as error:
+                print(f"ERROR: Socket error with exception: {error}")
+            finally:
+                for i in send_slots:
+                    sequences[i] = (sequences[i] + 1) % 256
         
         if self.if_sync:  # if we want to send artsync
             self.send_artsync()
@@ -217,17 +270,31 @@ class StupidArtnet():
 
     def start(self):
         """Starts thread clock."""
-        self.show()
-        if not hasattr(self, "running"):
-            self.running = True
-        if self.running:
-            sleep((1000.0 / self.fps) / 1000.0)
-            _thread.start_new_thread(self.start, ())
+        self.running = True
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run_loop, name="StupidArtnet", daemon=True)
+            self._thread.start()
+
+
+    def _run_loop(self):
+        """Calls show() at fps against an absolute deadline so sleep overshoot does not add up."""
+        next_frame = perf_counter()
+        while self.running:
+            self.show(next_frame)  # the deadline is "now" within the sleep slack
+            next_frame += 1.0 / self.fps
+            delay = next_frame - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            else:
+                next_frame = perf_counter()  # fell behind, do not try to catch up with a burst
 
 
     def stop(self):
         """Set flag so thread will exit."""
         self.running = False
+        thread = getattr(self, "_thread", None)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
 
     # SETTERS - HEADER #
 
@@ -247,10 +314,9 @@ class StupidArtnet():
             u = put_in_range(universe, 0, 15, False)
         
         self.universes = [u]
-        self.universe_buffer = {u: bytearray(self.packet_size)}
-        self.last_sent_buffer = {u: bytearray(self.packet_size)}
-        self.last_send_time = {u: 0.0}
-        self.sequences = {u: 0 for u in self.universes}
+        self.make_buffers()
+        self.make_universe_state()
+        self.make_headers()
 
 
     def set_subnet(self, sub):
@@ -259,6 +325,7 @@ class StupidArtnet():
         Set simplify to false to use
         """
         self.subnet = put_in_range(sub, 0, 15, False)
+        self.make_headers()
 
 
     def set_net(self, net):
@@ -267,46 +334,56 @@ class StupidArtnet():
         Set simplify to false to use
         """
         self.net = put_in_range(net, 0, 127, False)
+        self.make_headers()
 
 
     def set_packet_size(self, packet_size):
         """Setter for packet size (2 - 512, even only)."""
         self.packet_size = put_in_range(packet_size, 2, 512, self.make_even)
-        for u in self.universes:
-            # Resize existing buffers
-            new_buffer = bytearray(self.packet_size)
-            old_buffer = self.universe_buffer.get(u, b'')
-            length = min(len(old_buffer), self.packet_size)
-            new_buffer[:length] = old_buffer[:length]
-            self.universe_buffer[u] = new_buffer
-            
-            # Also resize last_sent_buffer
-            new_last_sent = bytearray(self.packet_size)
-            old_last_sent = self.last_sent_buffer.get(u, b'')
-            length_last = min(len(old_last_sent), self.packet_size)
-            new_last_sent[:length_last] = old_last_sent[:length_last]
-            self.last_sent_buffer[u] = new_last_sent
+        self.make_buffers(self.buffer)  # Resize existing buffers
+        self.dirty_version = [version + 1 for version in self.dirty_version]
+        self.make_headers()
 
     # SETTERS - DATA #
 
     def clear(self, universe=None):
         """Clear DMX buffer."""
         if universe is not None:
-            self.universe_buffer[universe] = bytearray(self.packet_size)
+            i = self.universe_index[universe]
+            self.buffer[i].fill(0)
+            self.dirty_version[i] += 1
         else:
-            for u in self.universes:
-                self.universe_buffer[u] = bytearray(self.packet_size)
+            self.buffer.fill(0)
+            self.dirty_version = [version + 1 for version in self.dirty_version]
 
 
     def set(self, value, universe=None):
-        """Set buffer."""
+        """Set buffer.
+
+        value can be a list of ints, a bytes-like object or a uint8 numpy array, it is copied into the universe's row.
+        Returns True if the data of the universe changed.
+        """
         if universe is None:
             universe = self.universes[0]
             
         if len(value) != self.packet_size:
             print("ERROR: packet does not match declared packet size")
-            return
-        self.universe_buffer[universe] = bytearray(value) if isinstance(value, (list, bytes)) else value
+            return False
+        if isinstance(value, np.ndarray):
+            if value.dtype != np.uint8 or not value.flags.c_contiguous:
+                value = np.ascontiguousarray(value, dtype=np.uint8)
+            value = memoryview(value)
+        elif isinstance(value, list):
+            value = bytearray(value)  # raises for values outside 0-255
+
+        # compare and copy through the row's memoryview, both are a single memcmp / memcpy
+        i = self.universe_index[universe]
+        row = self.rows[i]
+        if row == value:
+            return False  # same data, keep the universe clean
+        row[:] = value
+        self.dirty_version[i] += 1
+        return True
 
 
     def set_16bit(self, address, value, high_first=False, universe=None):
@@ -320,15 +397,15 @@ class StupidArtnet():
         if address < 1 or address > 512 - 1:
             print("ERROR: Address out of range")
             return
-        value = put_in_range(value, 0, 65535, False)
+        if not 0 <= value <= 65535:
+            value = 0 if value < 0 else 65535
 
         # Check for endianess
         if high_first:
-            self.universe_buffer[universe][address - 1] = (value >> 8) & 0xFF  # high
-            self.universe_buffer[universe][address] = (value) & 0xFF 			# low
+            _PACK_U16_BE(self.universe_buffer[universe], address - 1, value)
         else:
-            self.universe_buffer[universe][address - 1] = (value) & 0xFF				# low
-            self.universe_buffer[universe][address] = (value >> 8) & 0xFF  # high
+            _PACK_U16_LE(self.universe_buffer[universe], address - 1, value)
+        self.dirty_version[self.universe_index[universe]] += 1
 
 
     def set_single_value(self, address, value, universe=None):
@@ -342,7 +419,8 @@ class StupidArtnet():
         if address < 1 or address > 512:
             print("ERROR: Address out of range")
             return
-        self.universe_buffer[universe][address - 1] = put_in_range(value, 0, 255, False)
+        self.universe_buffer[universe][address - 1] = value if 0 <= value <= 255 else (0 if value < 0 else 255)
+        self.dirty_version[self.universe_index[universe]] += 1
 
 
     def set_single_rem(self, address, value, universe=None):
@@ -357,7 +435,8 @@ class StupidArtnet():
             print("ERROR: Address out of range")
             return
         self.clear(universe)
-        self.universe_buffer[universe][address - 1] = put_in_range(value, 0, 255, False)
+        self.universe_buffer[universe][address - 1] = value if 0 <= value <= 255 else (0 if value < 0 else 255)
+        self.dirty_version[self.universe_index[universe]] += 1
 
 
     def set_rgb(self, address, red, green, blue, universe=None):
@@ -372,9 +451,12 @@ class StupidArtnet():
             print("ERROR: Address out of range")
             return
 
-        self.universe_buffer[universe][address - 1] = put_in_range(red, 0, 255, False)
-        self.universe_buffer[universe][address] = put_in_range(green, 0, 255, False)
-        self.universe_buffer[universe][address + 1] = put_in_range(blue, 0, 255, False)
+        # clamp inline, values are almost always in range already
+        _PACK_RGB(self.universe_buffer[universe], address - 1,
+                  red if 0 <= red <= 255 else (0 if red < 0 else 255),
+                  green if 0 <= green <= 255 else (0 if green < 0 else 255),
+                  blue if 0 <= blue <= 255 else (0 if blue < 0 else 255))
+        self.dirty_version[self.universe_index[universe]] += 1
 
     # AUX Function #
 
@@ -399,6 +481,7 @@ class StupidArtnet():
         if simplify == self.is_simplified:
             return
         self.is_simplified = simplify
+        self.make_headers()
 
 
     def see_header(self, universe=None):
@@ -412,9 +495,9 @@ class StupidArtnet():
         """Show buffer values."""
         if universe is None:
             for u in self.universes:
-                print(f"Universe {u}: {self.universe_buffer[u]}")
+                print(f"Universe {u}: {bytes(self.universe_buffer[u])}")
         else:
-            print(self.universe_buffer[universe])
+            print(bytes(self.universe_buffer[universe]))
 
 
     def blackout(self):
@@ -425,8 +508,8 @@ class StupidArtnet():
 
     def flash_all(self, delay=None):
         """Sends 255's all across."""
-        for u in self.universes:
-            self.set([255] * self.packet_size, universe=u)
+        self.buffer.fill(255)
+        self.dirty_version = [version + 1 for version in self.dirty_version]
         self.show()
         # Blackout after delay
         if delay:
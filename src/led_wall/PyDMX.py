@@ -51,6 +51,16 @@ class PyDMX:
         # Sleep
         time.sleep(self.sleepms/1000.0) # between 0 - 1 sec
 
+    def set_frame(self,buf):
+        # Send a complete frame (start code + channels) in one write, without the trailing sleep of send()
+        self.ser.break_condition = True
+        time.sleep(self.breakus/1000000.0)
+
+        self.ser.break_condition = False
+        time.sleep(self.MABus/1000000.0)
+
+        self.ser.write(buf)
+
     def sendzero(self):
         self.data = np.zeros([self.channel_num+1],dtype='uint8')
         self.send()
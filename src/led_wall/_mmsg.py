@@ -0,0 +1,50 @@
+"""
+ctypes bindings shared by the batched Art-Net receiver and sender.
+
+``recvmmsg(2)`` and ``sendmmsg(2)`` take an array of ``struct mmsghdr``, each
+pointing to one ``struct iovec`` inside a preallocated slot buffer.  Both are
+Linux only, :func:`load_libc` returns None on other platforms.
+"""
+
+from __future__ import annotations
+
+import sys
+import ctypes
+import ctypes.util
+from typing import Callable
+
+SLOT_SIZE = 1024  # bytes reserved per datagram, an ArtDmx packet is at most 530 bytes
+
+
+class IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def load_libc(name: str, argtypes: list, restype=ctypes.c_int) -> Callable | None:
+    """Return the libc function name with the given signature or None if it is not available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        function = getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = argtypes
+    function.restype = restype
+    return function
@@ -0,0 +1,173 @@
+"""
+Direct ArtDmx receiver for a contiguous range of Art-Net universes.
+
+Replaces ``stupidArtnet.StupidArtnetServer`` on the receive hot path: the UDP
+socket is read by a single background thread which parses the ArtDmx header
+inline with ``struct`` and hands a ``memoryview`` of the DMX payload to a
+callback.  On Linux up to :attr:`ArtNetInput.BATCH_SIZE` datagrams are pulled
+per syscall with ``recvmmsg(2)``; other platforms fall back to
+``socket.recvfrom_into`` into a preallocated buffer.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import socket
+import struct
+import threading
+from typing import Callable
+from logging import getLogger
+
+from led_wall._mmsg import SLOT_SIZE, IOVec, MMsgHdr, load_libc
+
+logger = getLogger(__name__)
+
+ARTNET_ID = b"Art-Net\x00"
+OP_DMX = 0x5000
+HEADER_SIZE = 18
+RECEIVE_TIMEOUT = 0.5  # seconds, how often the receive thread checks for stop()
+
+_ID_OPCODE = struct.Struct("<8sH")  # id and opcode (low byte first)
+_UNIVERSE = struct.Struct("<H")  # port-address (low byte first) at offset 14
+_LENGTH = struct.Struct(">H")  # payload length (high byte first) at offset 16
+
+_MSG_WAITFORONE = 0x10000
+
+
+_recvmmsg = load_libc(
+    "recvmmsg", [ctypes.c_int, ctypes.POINTER(MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p])  # Linux only
+
+
+class ArtNetInput:
+    """Receives ArtDmx packets for a contiguous range of universes.
+
+    Parameters
+    ----------
+    port:
+        UDP port to listen on.
+    start_universe:
+        First Art-Net port-address (15 bit universe) to accept.
+    n_universes:
+        Number of consecutive universes to accept.
+    callback:
+        Called on the receive thread as ``callback(data, universe)`` with a
+        ``memoryview`` of the DMX payload.  The view is only valid during the
+        call, copy it if it needs to be kept.
+    bind_address:
+        IP address to bind to, empty string binds to all interfaces.
+    """
+
+    BATCH_SIZE: int = 64  # datagrams per recvmmsg call
+
+    def __init__(
+        self,
+        port: int = 6454,
+        start_universe: int = 0,
+        n_universes: int = 1,
+        callback: Callable[[memoryview, int], None] | None = None,
+        bind_address: str = "",
+    ) -> None:
+        self.port: int = port
+        self.start_universe: int = start_universe
+        self.n_universes: int = n_universes
+        self.callback: Callable[[memoryview, int], None] | None = callback
+
+        self.socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((bind_address, port))
+
+        self._running: bool = True
+        self.thread: threading.Thread = threading.Thread(
+            target=self._receive_loop,
+            name=f"ArtNetInput-{port}",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def close(self) -> None:
+        """Stop the receive thread and close the socket."""
+        self._running = False
+        if self.thread is not threading.current_thread():
+            self.thread.join(timeout=2 * RECEIVE_TIMEOUT)
+        self.socket.close()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, packet: memoryview, size: int) -> None:
+        """Parse a single datagram and forward the DMX payload of accepted universes."""
+        if size < HEADER_SIZE:
+            return
+        packet_id, opcode = _ID_OPCODE.unpack_from(packet)
+        if packet_id != ARTNET_ID or opcode != OP_DMX:
+            return
+
+        universe = _UNIVERSE.unpack_from(packet, 14)[0]
+        if not 0 <= universe - self.start_universe < self.n_universes:
+            return
+
+        length = min(_LENGTH.unpack_from(packet, 16)[0], size - HEADER_SIZE)
+        self.callback(packet[HEADER_SIZE:HEADER_SIZE + length], universe)
+
+    def _receive_loop(self) -> None:
+        if _recvmmsg is not None:
+            self._receive_loop_batched()
+        else:
+            self._receive_loop_single()
+
+    def _receive_loop_single(self) -> None:
+        """Portable fallback, one datagram per syscall into a preallocated buffer."""
+        self.socket.settimeout(RECEIVE_TIMEOUT)
+        buffer = bytearray(SLOT_SIZE)
+        view = memoryview(buffer)
+        while self._running:
+            try:
+                size = self.socket.recv_into(buffer)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if self._running:
+                    logger.error(f"ArtNet receive error: {e}")
+                break
+            try:
+                self._dispatch(view, size)
+            except Exception:
+                logger.exception("ArtNetInput callback error")
+
+    def _receive_loop_batched(self) -> None:
+        """Linux fast path, up to BATCH_SIZE datagrams per recvmmsg call."""
+        # Keep the socket blocking with a kernel receive timeout so stop() is noticed
+        seconds = int(RECEIVE_TIMEOUT)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO,
+                               struct.pack("ll", seconds, int((RECEIVE_TIMEOUT - seconds) * 1_000_000)))
+
+        batch = self.BATCH_SIZE
+        buffer = (ctypes.c_char * (batch * SLOT_SIZE))()
+        view = memoryview(buffer).cast("B")
+        base = ctypes.addressof(buffer)
+        iovecs = (IOVec * batch)()
+        msgs = (MMsgHdr * batch)()
+        for i in range(batch):
+            iovecs[i].iov_base = base + i * SLOT_SIZE
+            iovecs[i].iov_len = SLOT_SIZE
+            msgs[i].msg_hdr.msg_iov = ctypes.pointer(iovecs[i])
+            msgs[i].msg_hdr.msg_iovlen = 1
+        slots = [view[i * SLOT_SIZE:(i + 1) * SLOT_SIZE] for i in range(batch)]
+
+        fd = self.socket.fileno()
+        while self._running:
+            received = _recvmmsg(fd, msgs, batch, _MSG_WAITFORONE, None)
+            if received < 0:
+                err = ctypes.get_errno()
+                if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    continue
+                if self._running:
+                    logger.error(f"ArtNet receive error: {errno.errorcode.get(err, err)}")
+                break
+            for i in range(received):
+                try:
+                    self._dispatch(slots[i], msgs[i].msg_len)
+                except Exception:
+                    logger.exception("ArtNetInput callback error")
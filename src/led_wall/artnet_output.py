@@ -0,0 +1,159 @@
+"""
+Batched UDP sends for Art-Net output.
+
+:class:`BatchSender` hands all packets queued for a frame to the kernel at
+once.  On Linux this is a single ``sendmmsg(2)`` call on a connected socket
+from buffers registered once at construction; other platforms and unconnected
+sockets fall back to one send per packet.  A packet can be given as a tuple of parts (e.g. header and
+payload) so callers do not have to concatenate them.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import socket
+from typing import Sequence, Union
+
+from led_wall._mmsg import SLOT_SIZE, IOVec, MMsgHdr, load_libc
+
+
+_sendmmsg = load_libc("sendmmsg", [ctypes.c_int, ctypes.POINTER(MMsgHdr), ctypes.c_uint, ctypes.c_int])  # Linux only
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")  # not available on Windows
+
+
+Buffer = Union[bytes, bytearray, memoryview]
+Packet = Union[Buffer, tuple[Buffer, ...]]  # a datagram or its parts in order
+
+ARTDMX_HEADER_SIZE = 18
+ARTNET_PROTOCOL_VERSION = 14
+
+
+def make_artdmx_header(universe: int, size: int, sequence: int = 0, physical: int = 0,
+                       subnet: int | None = None, net: int = 0) -> bytearray:
+    """Build the ArtDmx header for a payload of size channels.
+
+    Without subnet, universe is the whole 15 bit port-address. With subnet it is the
+    universe within the subnet and net, split as specified in Art-Net 4
+    (bits 0-3 universe, 4-7 subnet, 8-14 net). A sequence of 0 disables sequencing.
+    """
+    header = bytearray(b'Art-Net\x00')
+    header += (0x5000).to_bytes(2, 'little')                   # opcode ArtDmx, low byte first
+    header += ARTNET_PROTOCOL_VERSION.to_bytes(2, 'big')       # protocol version, high byte first
+    header.append(sequence)
+    header.append(physical)
+    if subnet is None:
+        header += universe.to_bytes(2, 'little')               # port-address, low byte first
+    else:
+        header.append(subnet << 4 | universe)
+        header.append(net & 0xFF)
+    header += size.to_bytes(2, 'big')                          # payload length, high byte first
+    return header
+
+
+def make_artdmx_packet(universe: int, size: int, **header) -> bytearray:
+    """Build an ArtDmx packet with a zeroed payload of size channels, header takes the options of make_artdmx_header"""
+    return make_artdmx_header(universe, size, **header) + bytearray(size)
+
+
+class BatchSender:
+    """Sends batches of datagrams on a connected UDP socket from preregistered buffers.
+
+    The ctypes slot buffer, iovecs and message headers are allocated once, a
+    flush only copies the packets into their slots and issues one
+    ``sendmmsg(2)`` call.
+
+    Parameters
+    ----------
+    sock:
+        Connected datagram socket (``connect`` or ``remote_addr`` was used).
+    batch_size:
+        Maximum number of packets per syscall, larger batches are split.
+    address:
+        Destination for an unconnected socket, every packet is then sent on
+        its own with ``sendmsg``/``sendto``.
+    """
+
+    def __init__(self, sock: socket.socket, batch_size: int = 64, address: tuple | None = None) -> None:
+        self.sock: socket.socket = sock
+        self.batch_size: int = batch_size
+        self.address: tuple | None = address
+
+        self._buffer = (ctypes.c_char * (batch_size * SLOT_SIZE))()
+        self._view = memoryview(self._buffer).cast("B")
+        base = ctypes.addressof(self._buffer)
+        self._iovecs = (IOVec * batch_size)()
+        self._msgs = (MMsgHdr * batch_size)()
+        for i in range(batch_size):
+            self._iovecs[i].iov_base = base + i * SLOT_SIZE
+            self._msgs[i].msg_hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            self._msgs[i].msg_hdr.msg_iovlen = 1
+
+    def send(self, packets: Sequence[Packet]) -> int:
+        """Send packets in order, in as few syscalls as possible.
+
+        Parts of a tuple packet are gathered into its slot (sendmmsg) or passed
+        as an iovec with ``sendmsg``; without ``sendmsg`` they are gathered into
+        the first slot, so no packet is allocated per send.
+
+        Returns
+        -------
+        int
+            Number of packets handed to the kernel.
+        """
+        count = len(packets)
+        if self.address is not None:
+            for packet in packets:
+                if type(packet) is not tuple:
+                    self.sock.sendto(packet, self.address)
+                elif _HAS_SENDMSG:
+                    self.sock.sendmsg(packet, (), 0, self.address)
+                else:
+                    self.sock.sendto(self._view[:self._gather(packet, 0)], self.address)
+            return count
+        if _sendmmsg is None or count == 1:
+            for packet in packets:
+                if type(packet) is not tuple:
+                    self.sock.send(packet)
+                elif _HAS_SENDMSG:
+                    self.sock.sendmsg(packet)
+                else:
+                    self.sock.send(self._view[:self._gather(packet, 0)])
+            return count
+
+        view = self._view
+        sent = 0
+        for start in range(0, count, self.batch_size):
+            chunk = packets[start:start + self.batch_size]
+            for i, packet in enumerate(chunk):
+                offset = i * SLOT_SIZE
+                if type(packet) is tuple:
+                    size = self._gather(packet, offset)
+                else:
+                    size = len(packet)
+                    view[offset:offset + size] = packet
+                self._iovecs[i].iov_len = size
+            sent += self._sendmmsg(len(chunk))
+        return sent
+
+    def _gather(self, parts: tuple[Buffer, ...], offset: int) -> int:
+        """Copy the parts of a packet back to back into the slot buffer at offset, returns the packet size."""
+        view = self._view
+        end = offset
+        for part in parts:
+            size = len(part)
+            view[end:end + size] = part
+            end += size
+        return end - offset
+
+    def _sendmmsg(self, count: int) -> int:
+        fd = self.sock.fileno()
+        done = 0
+        while done < count:
+            result = _sendmmsg(fd, ctypes.pointer(self._msgs[done]), count - done, 0)
+            if result < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err))
+            done += result
+        return done
+
@@ -2,13 +2,24 @@ from .base_effect import BaseEffect
 
 #bit ugly to import all files
 import importlib
-from os.path import dirname, basename, isfile, join
-import glob
-modules = glob.glob(join(dirname(__file__), "*.py"))
-__all__ = [ basename(f)[:-3] for f in modules if isfile(f) and not f.endswith('__init__.py') and not f.endswith('base_effect.py') and not f.endswith('effect_manager.py')]
+import os
+from os.path import dirname
 
+_NOT_EFFECTS = ('__init__.py', 'base_effect.py', 'effect_manager.py')
+with os.scandir(dirname(__file__)) as entries:
+    __all__ = sorted(entry.name[:-3] for entry in entries
+                     if entry.is_file() and entry.name.endswith('.py') and entry.name not in _NOT_EFFECTS)
+
+
+_effects: tuple[type[BaseEffect], ...] | None = None
+_effects_by_name: dict[str, type[BaseEffect]] = {} # by class name and by NAME
+
+def get_effects() -> tuple[type[BaseEffect], ...]:
+    """Imports all effect modules on the first call, later calls return the cached tuple (SingleColor first, then sorted by NAME)"""
+    global _effects
+    if _effects is not None:
+        return _effects
 
-def get_effects():
     for module in __all__:
         importlib.import_module(f".{module}", package=__name__)
     
@@ -20,11 +31,13 @@ def get_effects():
         if effect.__name__ == "SingleColor":
             sorted_effects.insert(0, sorted_effects.pop(i))
             break
-    return sorted_effects
+
+    for effect in sorted_effects:
+        _effects_by_name.setdefault(effect.NAME, effect)
+    _effects_by_name.update({effect.__name__: effect for effect in sorted_effects}) # class names win over display names
+    _effects = tuple(sorted_effects)
+    return _effects
 
 def get_effect_class(name) -> type[BaseEffect] | None:
-    effects = get_effects()
-    for effect in effects:
-        if effect.__name__ == name:
-            return effect
-    return None
\ No newline at end of file
+    get_effects()
+    return _effects_by_name.get(name)
@@ -32,6 +32,11 @@ class BaseEffect:
         self.saved_inputs = settings_manager.get_setting("saved_inputs",{})
         self.setup = False
 
+        # constant placeholder frame returned by run_raw, read-only as it is shared between frames
+        self._const_frame = np.zeros((resolution[0], resolution[1], 4), dtype=np.uint8)
+        self._const_frame[..., 3] = 255 #placeholder outputs white
+        self._const_frame.flags.writeable = False
+
         self.setup_settings()
 
         #add custom inputs after the existing ones but never remove "master", "rgbw_color" and "mode" as they are reserved
@@ -40,35 +45,85 @@ class BaseEffect:
             'rgbw_color': RGBW_Color([0, 0, 0, 0]),
             'mode': Fader(), #selects the active effect
         }
+        self._master: Fader = self.inputs['master'] #bound once, read every frame
+        self._input_slices: list[tuple[str, InputType, int, int]] = [] #(name, input, start, end) DMX channel range of every input, see _rebuild_slices
+        self._slices_key: list[tuple[str, int, int]] | None = None #(name, id(input), n_channels) of the inputs the slice table was built from
+
+    def _init_frame_buffers(self, shape: tuple[int, int] | None = None) -> None:
+        """
+        allocate two uint8 output frames used alternately and a float32 scratch frame for _lerp_colors,
+        call in __init__ of effects rendering with _next_output, shape defaults to the resolution
+        """
+        shape = tuple(shape) if shape is not None else tuple(self.resolution)
+        self._out = [np.empty((*shape, 4), dtype=np.uint8) for _ in range(2)]
+        self._out_index = 0
+        self._scratch = np.empty((*shape, 4), dtype=np.float32)
+
+    def _next_output(self) -> np.ndarray:
+        """
+        returns the output frame that was not returned last, the previous frame stays intact while this one is rendered
+        """
+        self._out_index ^= 1
+        return self._out[self._out_index]
+
+    def _lerp_colors(self, t: np.ndarray, c1: np.ndarray, c2: np.ndarray, out: np.ndarray, clip: bool = False) -> np.ndarray:
+        """
+        blend per pixel between the colors c1 (t = 0) and c2 (t = 1) into the uint8 frame out
+
+        c1 * (1-t) + c2 * t is computed as c1 + (c2 - c1) * t in the float32 scratch frame,
+        t may be a view into the scratch frame, numpy buffers overlapping operands
+        """
+        scratch = self._scratch
+        np.multiply(t[:, :, np.newaxis], c2 - c1, out=scratch)
+        np.add(scratch, c1, out=scratch)
+        if clip:
+            np.clip(scratch, 0, 255, out=scratch)
+        np.copyto(out, scratch, casting='unsafe')
+        return out
 
     def run_raw(self, DMX_channels,last_output:np.array) -> np.array:
         """
         Returns a dictionary with all inputs for the effect.
         """
         self.update_inputs(DMX_channels)
-        
-        output_array = np.full((self.resolution[0], self.resolution[1], 4), [0,0,0,255], dtype=np.uint8) #placeholder outputs white
 
-        return output_array
+        return self._const_frame
 
-    def update_inputs(self,DMX_channels):
-        #parse DMX_Channels
+    def _rebuild_slices(self) -> None:
+        """
+        precompute the DMX channel range of every input, update_inputs calls it when an input was added, replaced or resized
+        """
+        self._slices_key = self._inputs_key()
+        self._input_slices = []
         processed_channel = 0
-        for input_name in self.inputs:
-            input = self.inputs[input_name]
+        for input_name, input in self.inputs.items():
             n_channels = input.n_channels
+            self._input_slices.append((input_name, input, processed_channel, processed_channel + n_channels))
+            processed_channel += n_channels
+
+    def _inputs_key(self) -> list[tuple[str, int, int]]:
+        """
+        identifies the current inputs and their channel counts, the slice table is valid as long as it is unchanged
+        """
+        return [(input_name, id(input), input.n_channels) for input_name, input in self.inputs.items()]
+
+    def update_inputs(self,DMX_channels):
+        #parse DMX_Channels, DMX_channels can be a list or a numpy array
+        #subclasses add or replace inputs after BaseEffect.__init__, so the slice table is rebuilt when the inputs change
+        if self._inputs_key() != self._slices_key:
+            self._rebuild_slices()
 
+        saved_inputs = self.saved_inputs
+        for input_name, input, start, end in self._input_slices:
             #if save input for this input is enabled in the settings load the saved value
-            if input.allow_saving and self.saved_inputs and input_name in self.saved_inputs:
-                saved_channels = self.saved_inputs[input_name]
+            if saved_inputs and input.allow_saving and input_name in saved_inputs:
+                saved_channels = saved_inputs[input_name]
                 if saved_channels is not None:
                     input.save_in_settings = True #mark the input as saved in the settings to show it in the UI
                     input.set_channels(saved_channels)
-                    processed_channel += n_channels #skip processing the channels for this input as it is loaded from the settings, but still increase the processed_channel to keep the correct channel index for the next inputs
-                    continue
-            
-            input.set_channels(DMX_channels[processed_channel:processed_channel + n_channels])
-            processed_channel += n_channels
+                    continue #skip processing the channels for this input as it is loaded from the settings, the slice table keeps the channel index of the next inputs
+
+            input.set_channels(DMX_channels[start:end])
 
     def setup_settings(self) -> None:
         """
@@ -44,48 +44,45 @@ class Circle(BaseEffect):
         self.phys_w = dim_x
         self.phys_h = dim_y
 
+        self._init_frame_buffers()
+
     def run_raw(self, DMX_channels, last_output: np.array) -> np.array:
         """
         Calculates a frame with a filled circle.
         """
-        master = self.inputs['master'].value / 255.0
+        master = self._master.normalized
         c_outside = np.array(self.inputs['rgbw_color'].get_channels(), dtype=np.float32) * master
         c_inside = np.array(self.inputs['color2'].get_channels(), dtype=np.float32) * master
 
         # Radius in physical space: 0-255 maps to 0 .. max(phys_w, phys_h)/2
         max_radius = max(self.phys_w, self.phys_h)
-        radius = (self.inputs['radius'].value / 255.0) * max_radius
+        radius = self.inputs['radius'].normalized * max_radius
 
         # X position in physical space: 0-255 maps to (-radius) .. (phys_w + radius)
-        pos_x_norm = self.inputs['pos_x'].value / 255.0
+        pos_x_norm = self.inputs['pos_x'].normalized
         cx = -radius*2 + pos_x_norm * (self.phys_w + 4 * radius)
 
         # Y position in physical space: 0-255 maps to (-radius) .. (phys_h + radius)
-        pos_y_norm = self.inputs['pos_y'].value / 255.0
+        pos_y_norm = self.inputs['pos_y'].normalized
         cy = -radius*2 + pos_y_norm * (self.phys_h + 4 * radius)
 
         # Blend width in physical space: 0 = hard edge, 255 = fade over max radius
-        blend_norm = self.inputs['blend'].value / 255.0
+        blend_norm = self.inputs['blend'].normalized
         blend_width = blend_norm * max_radius
 
         # Euclidean distance in physical space (corrected for non-square pixels)
         dist = np.sqrt((self.xv - cx) ** 2 + (self.yv - cy) ** 2)
 
+        output_array = self._next_output()
         if blend_width < 1e-6:
             # Hard edge
             inside_mask = dist <= radius
-            output_array = np.empty((self.res_x, self.res_y, 4), dtype=np.uint8)
             output_array[:] = np.clip(c_outside, 0, 255).astype(np.uint8)
             output_array[inside_mask] = np.clip(c_inside, 0, 255).astype(np.uint8)
         else:
             # Smooth blend: t=1 inside, t=0 outside, smooth transition in between
             t = np.clip(1.0 - (dist - radius) / blend_width, 0.0, 1.0)
-            t_3d = t[:, :, np.newaxis]  # (res_x, res_y, 1)
-            # Reshape colors to (1, 1, 4) for explicit 4-channel broadcasting
-            c_in = c_inside.reshape(1, 1, 4)
-            c_out = c_outside.reshape(1, 1, 4)
-            blended = c_in * t_3d + c_out * (1.0 - t_3d)
-            output_array = np.clip(blended, 0, 255).astype(np.uint8)
+            self._lerp_colors(t, c_outside, c_inside, output_array, clip=True)
 
         return output_array
 
@@ -13,6 +13,13 @@ from led_wall.ui.media_manager import MediaManager
 logger = logging.getLogger("utils")
 logger.setLevel(logging.DEBUG)
 
+
+def _resize_line(values: np.ndarray, length: int) -> np.ndarray:
+    """1D linear resize with the same pixel center mapping as cv2.resize INTER_LINEAR"""
+    positions = (np.arange(length) + 0.5) * (len(values) / length) - 0.5
+    return np.interp(positions, np.arange(len(values)), values).astype(np.float32)
+
+
 class ColorMix(BaseEffect):
     """
     Effect that blends between two colors using different noise patterns or an image.
@@ -57,7 +64,17 @@ class ColorMix(BaseEffect):
 
         self.res_x, self.res_y = self.resolution
         self._noise_pattern = None
+        self._noise_buf = np.empty((self.res_x, self.res_y), dtype=np.float32) # generated noise patterns are written in here
         self._last_noise_settings = None
+        self._noise_version = 0 # bumped whenever _generate_noise produces a new pattern
+        self._settings_version = -1 # settings_manager.version the cached settings below were read at
+        self._mix_mode = 'Noise'
+        self._category = 1
+        self._media_settings = ()
+        self._last_blend_key = None
+        self._color_tables = {} # input name -> (color tuple, (256, 4) float32 color scaled by every master value)
+
+        self._init_frame_buffers()
 
     def _get_media_files(self):
         if not os.path.exists('media'):
@@ -71,53 +88,84 @@ class ColorMix(BaseEffect):
         """
         # update_inputs is called by EffectManager before this method
         
-        # Get input values and normalize
-        master = self.inputs['master'].value / 255.0
-        c1 = np.array(self.inputs['rgbw_color'].get_channels()) * master
-        c2 = np.array(self.inputs['color2'].get_channels()) * master
-        
-        blend_offset = (self.inputs['blend'].value / 255.0) * 2.0 - 1.0
-        
         # Only regenerate noise if the pattern type, scale, mode or image has changed
         noise = self._generate_noise()
+
+        # Nothing changed since the last frame: the previous output is still valid
+        color1 = self.inputs['rgbw_color'].get_channels()
+        color2 = self.inputs['color2'].get_channels()
+        blend_key = (self.inputs['master'].value, tuple(color1), tuple(color2), self.inputs['blend'].value, self._noise_version)
+        if blend_key == self._last_blend_key:
+            return self._out[self._out_index] # not modified downstream, the IO manager copies it into the universes
+
+        # Get input values and normalize
+        master = int(self.inputs['master'].value)
+        c1 = self._color_table('rgbw_color', blend_key[1])[master]
+        c2 = self._color_table('color2', blend_key[2])[master]
         
-        # Apply blend offset to noise values and clip to [0, 1]
-        # t = 0 means color 1, t = 1 means color 2
-        t = np.clip(noise + blend_offset, 0.0, 1.0)
-        
-        # Reshape for broadcasting (res_x, res_y, 1) to match color channels
-        t_3d = t[:, :, np.newaxis]
-        
+        blend_offset = self.inputs['blend'].normalized * 2.0 - 1.0
+
+        if self._out[0].shape[:2] != noise.shape:
+            # image frames can differ from the resolution, allocate matching buffers
+            self._init_frame_buffers(noise.shape)
+        output_array = self._next_output()
+
+        # Apply blend offset to noise values and clip to [0, 1], t = 0 means color 1, t = 1 means color 2
         # Linear interpolation: result = c1 * (1-t) + c2 * t
-        output_array = (c1 * (1.0 - t_3d) + c2 * t_3d).astype(np.uint8)
-        
+        t = self._scratch[:, :, 0]
+        np.add(noise, blend_offset, out=t)
+        np.clip(t, 0.0, 1.0, out=t)
+        self._lerp_colors(t, c1, c2, output_array)
+
+        self._last_blend_key = blend_key
         return output_array
 
+    def _color_table(self, input_name: str, color: tuple) -> np.ndarray:
+        """Returns the color scaled by every master value 0..255, only rebuilt when the color changed."""
+        cached = self._color_tables.get(input_name)
+        if cached is None or cached[0] != color:
+            table = np.asarray(color, dtype=np.float32)[np.newaxis, :] * (np.arange(256, dtype=np.float32) / np.float32(255.0))[:, np.newaxis]
+            cached = self._color_tables[input_name] = (color, table)
+        return cached[1]
+
+    def _read_settings(self) -> None:
+        """Re-reads the settings used for the noise pattern, only if the settings changed since the last read."""
+        version = self.settings_manager.version
+        if version == self._settings_version:
+            return
+        self._settings_version = version
+
+        get_setting = self.settings_manager.get_setting
+        self._mix_mode = get_setting('mix_mode') or 'Noise'
+        category = get_setting('noise_pattern_type')
+        self._category = 1 if category is None else category # Default to Smooth Noise
+        self._media_settings = tuple(get_setting(setting_id) for setting_id in (
+            self.media_manager.media_path_setting_id,
+            self.media_manager.fill_mode_setting_id,
+            self.media_manager.offset_x_id,
+            self.media_manager.offset_y_id,
+            self.media_manager.scale_id,
+            self.media_manager.rotation_id))
+
     def _generate_noise(self):
         """Generates or retrieves the cached noise pattern based on current settings."""
-        mix_mode = self.settings_manager.get_setting('mix_mode') or 'Noise'
+        self._read_settings()
+        mix_mode = self._mix_mode
 
         if mix_mode == 'Video':
             # Get frame from VideoManager (H, W, 3)
             frame = self.video_manager.get_frame()
+            self._noise_version += 1
             # Use only one channel (as it's grayscale) and transpose to (W, H)
-            return frame[:, :, 0].T.astype(float) / 255.0
+            return np.ascontiguousarray(frame[:, :, 0].T, dtype=np.float32) * np.float32(1 / 255.0)
 
-        category = self.settings_manager.get_setting('noise_pattern_type')
-        if category is None:
-            category = 1 # Default to Smooth Noise
+        category = self._category
             
         noise_scale = self.inputs['noise_scale'].value
         seed = self.inputs['seed'].value
 
         # Settings that determine the noise pattern
-        current_settings = (mix_mode, category, noise_scale, seed,
-                        self.settings_manager.get_setting(self.media_manager.media_path_setting_id),
-                        self.settings_manager.get_setting(self.media_manager.fill_mode_setting_id),
-                        self.settings_manager.get_setting(self.media_manager.offset_x_id),
-                        self.settings_manager.get_setting(self.media_manager.offset_y_id),
-                        self.settings_manager.get_setting(self.media_manager.scale_id),
-                        self.settings_manager.get_setting(self.media_manager.rotation_id))
+        current_settings = (mix_mode, category, noise_scale, seed, self._media_settings)
         
         if self._noise_pattern is not None and self._last_noise_settings == current_settings:
             return self._noise_pattern
@@ -126,7 +174,7 @@ class ColorMix(BaseEffect):
             # Get frame from MediaManager (H, W, 3)
             frame = self.media_manager.get_frame()
             # Use only one channel (as it's grayscale) and transpose to (W, H)
-            self._noise_pattern = frame[:, :, 0].T.astype(float) / 255.0
+            self._noise_pattern = np.ascontiguousarray(frame[:, :, 0].T, dtype=np.float32) * np.float32(1 / 255.0)
         else:
             # Determine grid size for noise generation (min 2, max full resolution)
             min_grid = 2
@@ -134,23 +182,26 @@ class ColorMix(BaseEffect):
             grid_size = int(min_grid + (noise_scale / 255.0) * (max_grid - min_grid))
             grid_size = max(min_grid, grid_size)
 
-            # Use a deterministic seed from category and seed fader
-            rng = np.random.RandomState(seed=int(category) * 1000 + seed)
+            # Use a deterministic seed from category and seed fader, PCG64 draws float32 directly
+            rng = np.random.default_rng(int(category) * 1000 + seed)
 
-            if category == 0: # White Noise / Random Blocks
-                small_noise = rng.rand(grid_size, grid_size)
-            elif category == 1: # Smooth Noise
-                small_noise = rng.rand(grid_size, grid_size)
-            elif category == 2: # Horizontal Stripes
-                small_noise = rng.rand(grid_size, 1)
-            else: # Vertical Stripes (category 3)
-                small_noise = rng.rand(1, grid_size)
+            if category in (2, 3): # Horizontal / Vertical Stripes
+                # only one axis varies: interpolate a line instead of a 2D resize, then repeat it once into
+                # a C-contiguous pattern so every frame's blend reads it as one flat sweep
+                length = self.res_x if category == 2 else self.res_y
+                line = _resize_line(rng.random(grid_size, dtype=np.float32), length)
+                line = line[:, np.newaxis] if category == 2 else line[np.newaxis, :]
+                np.copyto(self._noise_buf, line)
+                self._noise_pattern = self._noise_buf
+            else: # White Noise / Random Blocks (0) and Smooth Noise (1)
+                small_noise = rng.random((grid_size, grid_size), dtype=np.float32)
 
-            # Resize to actual resolution
-            interp = cv2.INTER_NEAREST if category == 0 else cv2.INTER_LINEAR
-            self._noise_pattern = cv2.resize(small_noise, (self.res_y, self.res_x), interpolation=interp)
+                # Resize to actual resolution into the preallocated buffer, float32 halves the cached pattern compared to float64
+                interp = cv2.INTER_NEAREST_EXACT if category == 0 else cv2.INTER_LINEAR
+                self._noise_pattern = cv2.resize(small_noise, (self.res_y, self.res_x), dst=self._noise_buf, interpolation=interp)
 
         self._last_noise_settings = current_settings
+        self._noise_version += 1
         return self._noise_pattern
 
     def _update_noise_preview(self):
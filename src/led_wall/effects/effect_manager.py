@@ -309,9 +309,9 @@ class EffectManager():
 
         self.preview_timer = preview_setup(self.preview_image, io_manager=self.IO_manager)
     
-    def shutdown(self):
+    def stop_effects(self):
         """
-        shuts down the effect manager and all effects.
+        stops the preview and the active effect, the shared IO loop is left alone.
         """
         # Stop preview timer if it exists
         if hasattr(self, 'preview_timer') and self.preview_timer:
@@ -328,12 +328,33 @@ class EffectManager():
                 logger.info("Stopped active effect")
             except Exception as e:
                 logger.error(f"Error stopping effect: {e}")
-        
+
+    def suspend(self):
+        """
+        stops the preview, the active effect and the IO loop but keeps the effects so the manager can be resumed.
+        """
+        self.stop_effects()
+
         # Stop the IO manager loop
         if self.IO_manager:
             try:
                 self.IO_manager.stop_loop()
                 logger.info("Stopped IO manager loop")
-                del self.IO_manager
             except Exception as e:
-                logger.error(f"Error stopping IO manager: {e}")
\ No newline at end of file
+                logger.error(f"Error stopping IO manager: {e}")
+
+    def resume(self):
+        """
+        reactivates a suspended effect manager, the effects and their settings are reused.
+        """
+        self.IO_manager.create_frame = self.run_loop
+        self.change_active_effect(index=self.active_effect)
+
+    def shutdown(self):
+        """
+        shuts down the effect manager and all effects.
+        The IO manager is shared by all effect managers, its loop is stopped once by the application.
+        """
+        self.stop_effects()
+        if hasattr(self, 'IO_manager'):
+            del self.IO_manager
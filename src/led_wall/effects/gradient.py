@@ -32,6 +32,8 @@ class Gradient(BaseEffect):
         # indexing='ij' ensures first dimension is width (x), second is height (y)
         self.xv, self.yv = np.meshgrid(x, y, indexing='ij')
 
+        self._init_frame_buffers()
+
     def run_raw(self, DMX_channels, last_output: np.array) -> np.array:
         """
         Calculates the gradient frame.
@@ -39,16 +41,16 @@ class Gradient(BaseEffect):
         # Note: update_inputs is called by the EffectManager before this method
         
         # Get input values and normalize to 0.0-1.0
-        master = self.inputs['master'].value / 255.0
+        master = self._master.normalized
         c1 = np.array(self.inputs['rgbw_color'].get_channels()) * master
         c2 = np.array(self.inputs['color2'].get_channels()) * master
         
-        start = self.inputs['change_start'].value / 255.0
+        start = self.inputs['change_start'].normalized
         # Nonlinear scaling: x^2 gives more resolution at the lower end (near 0)
-        strength_raw = self.inputs['change_strength'].value / 255.0
+        strength_raw = self.inputs['change_strength'].normalized
         strength = strength_raw ** 4
         # Convert DMX direction (0-255) to angle (0 to 2*PI)
-        angle = (self.inputs['direction'].value / 255.0) * np.pi
+        angle = self.inputs['direction'].normalized * np.pi
         
         # Calculate projection vector based on angle
         dx = np.cos(angle)
@@ -67,11 +69,8 @@ class Gradient(BaseEffect):
         # We center the transition at 'start' (mapped from 0-1 to -0.5 to 0.5)
         t = np.clip((p - (start - 0.5)) * slope + 0.5, 0.0, 1.0)
         
-        # Reshape t for broadcasting: (res_x, res_y, 1) to match color arrays (4,)
-        t_3d = t[:, :, np.newaxis]
-        
         # Linear interpolation between c1 and c2
         # (res_x, res_y, 4) array
-        output_array = (c1 * (1.0 - t_3d) + c2 * t_3d).astype(np.uint8)
+        output_array = self._lerp_colors(t, c1, c2, self._next_output())
         
         return output_array
@@ -27,7 +27,7 @@ class ImageDisplay(BaseEffect):
         frame = np.transpose(frame, (1, 0, 2))
         
         # Apply master dimmer
-        master = self.inputs['master'].value / 255.0
+        master = self._master.normalized
         frame = (frame * master).astype(np.uint8)
 
         if self.rgbw:
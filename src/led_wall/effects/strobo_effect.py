@@ -179,7 +179,7 @@ class StroboEffect(BaseEffect):
         self.update_inputs(DMX_channels)
         
         # Get input values
-        master = self.inputs['master'].value / 255.0
+        master = self._master.normalized
         color = np.array(self.inputs['rgbw_color'].get_channels(), dtype=np.float32) * master
         color2 = np.array(self.inputs['color2'].get_channels(), dtype=np.float32) * master
         speed_val = self.inputs['speed'].value
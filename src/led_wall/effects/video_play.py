@@ -64,7 +64,7 @@ class VideoPlay(BaseEffect):
         frame = np.transpose(frame, (1, 0, 2))
         
         # Add master brightness
-        master = self.inputs['master'].value / 255.0
+        master = self._master.normalized
         frame = (frame * master).astype(np.uint8)
 
         if self.rgbw:
@@ -33,6 +33,8 @@ class WaveEffect(BaseEffect):
         # indexing='ij' ensures first dimension is width (x), second is height (y)
         self.xv, self.yv = np.meshgrid(x, y, indexing='ij')
 
+        self._init_frame_buffers()
+
     def run_raw(self, DMX_channels, last_output: np.array) -> np.array:
         """
         Calculates the wave pattern frame.
@@ -40,7 +42,7 @@ class WaveEffect(BaseEffect):
         self.update_inputs(DMX_channels)
         
         # Get input values and normalize
-        master = self.inputs['master'].value / 255.0
+        master = self._master.normalized
         c1 = np.array(self.inputs['rgbw_color'].get_channels()) * master
         c2 = np.array(self.inputs['color2'].get_channels()) * master
         
@@ -90,11 +92,8 @@ class WaveEffect(BaseEffect):
         # Normalize sine (-1 to 1) to (0 to 1) for color mix
         t = (val + 1) / 2.0
         
-        # Reshape t for broadcasting: (res_x, res_y, 1)
-        t_3d = t[:, :, np.newaxis]
-        
         # Linear interpolation
-        output_array = (c1 * (1.0 - t_3d) + c2 * t_3d).astype(np.uint8)
+        output_array = self._lerp_colors(t, c1, c2, self._next_output())
         
         return output_array
 
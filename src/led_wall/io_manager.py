@@ -1,6 +1,7 @@
 import time
+import functools
 import numpy as np
-from threading import Thread, current_thread
+from threading import Event, Thread, current_thread
 from logging import getLogger
 
 from led_wall.MultiUniverseArtnet import StupidArtnet
@@ -23,6 +24,7 @@ class IO_Manager():
     """
     output_buffer: np.ndarray = None
     SLEEP_THRESHOLD: float = 0.005  # seconds – spin-wait margin
+    IDLE_AFTER: float = 1.0  # seconds without a changed frame before the loop stops spin-waiting
 
     def __init__(self,settings_manager:SettingsManager,framerate:int=50,preview_in_window:bool=False) -> None:
         """
@@ -268,12 +270,21 @@ class IO_Manager():
         self.output_buffer = np.zeros((self.resolution[0], self.resolution[1], self.pixel_channels), dtype=np.uint8)
         
         self.create_frame = None #callback function to the selected effect
+        self.frame_ready = Event() #set after every frame that changed the Art-Net output, consumers (preview) clear it once they used the frame
 
         self.ts_last_frame = 0
         #no not start thread here to prevent issues with multiple instances of IO_Manager in the same process (e.g. when running multiple presets) which can cause multiple threads to be started and interfere with each other. Start the thread in the entry point instead.
         self.run = False
         self.run_thread = None 
 
+        #art-net output runs on its own thread while the loop renders the next frame, see step() and output_loop()
+        self.output_thread = None
+        self._send_frame: np.ndarray | None = None #private copy of the frame handed to the output thread, owned by it until _send_done is set
+        self._send_changed = False #whether the last frame sent by the output thread changed any universe
+        self._send_pending = Event() #set by step() when _send_frame holds a new frame, also wakes the thread to stop
+        self._send_done = Event() #set by the output thread once _send_frame was sent
+        self._send_done.set()
+
         #start input
         self.is_initialized = True
         self._init_sacn_input()
@@ -307,6 +318,7 @@ class IO_Manager():
         if self.run_thread is not None:
             if self.run_thread is current_thread():
                 self.run = True
+                self._start_output_thread()
                 # logger.debug("start_loop called from within run_loop. Ignoring restart request.")
                 return
 
@@ -323,9 +335,27 @@ class IO_Manager():
         self.run = True
         self.run_thread = Thread(target=self.run_loop, daemon=True)
         self.run_thread.start()
+        self._start_output_thread()
+
+    def _start_output_thread(self) -> None:
+        if self.output_thread is not None and self.output_thread.is_alive():
+            return
+        self._send_pending.clear()
+        self._send_done.set()
+        self.output_thread = Thread(target=self.output_loop, name="IO_Manager output", daemon=True)
+        self.output_thread.start()
+
+    def _stop_output_thread(self) -> None:
+        """
+        Wakes the output thread so it notices self.run is False and waits for it to exit.
+        """
+        self._send_pending.set()
+        if self.output_thread is not None and self.output_thread.is_alive() and self.output_thread is not current_thread():
+            self.output_thread.join(timeout=1.0)
 
     def stop_loop(self) -> None:
         self.run = False
+        self._stop_output_thread()
 
         # Stop sACN input
         if self.sacn_input is not None:
@@ -349,6 +379,7 @@ class IO_Manager():
         Stops the loop thread without tearing down ArtNet resources.
         """
         self.run = False
+        self._stop_output_thread()
         if self.run_thread is not None and self.run_thread.is_alive() and self.run_thread is not current_thread():
             try:
                 self.run_thread.join(timeout=2.0)
@@ -363,11 +394,13 @@ class IO_Manager():
 
         self.stop_loop()
 
-    def step(self):
+    def step(self) -> bool:
         """
         Single step of the loop.
         Calls sACN smoothing, updates sliders on change, renders the frame,
         and sends artnet output.
+        Returns True if the rendered frame differs from the previous one,
+        while the output thread is running this is known one frame later.
         """
         self.ts_last_frame = time.time()
 
@@ -382,7 +415,49 @@ class IO_Manager():
 
         self.output_buffer = frame
 
-        self.update_artnet_output()
+        if not self.run or self.output_thread is None or not self.output_thread.is_alive():
+            changed = self.update_artnet_output()
+            # only wake the preview for a new frame, a static scene causes no reloads or JPEG encoding
+            if changed:
+                self.frame_ready.set()
+            return changed
+
+        # the output thread still owns _send_frame while it sends the previous frame
+        if not self._send_done.wait(timeout=1.0):
+            logger.warning("Art-Net output thread is behind, frame dropped")
+            return False
+        changed = self._send_changed
+
+        # effects may render into last_output in place, so the thread sends from a private copy
+        if self._send_frame is None or self._send_frame.shape != frame.shape:
+            self._send_frame = frame.copy()
+        else:
+            np.copyto(self._send_frame, frame)
+        self._send_done.clear()
+        self._send_pending.set()
+        return changed
+
+    def output_loop(self):
+        """
+        Sends the frames handed over by step(), so rendering the next frame overlaps with sending the previous one.
+        Runs until self.run is False.
+        """
+        try:
+            while True:
+                self._send_pending.wait()
+                self._send_pending.clear()
+                if not self.run:
+                    break
+                try:
+                    self._send_changed = self.update_artnet_output(self._send_frame)
+                    if self._send_changed:
+                        self.frame_ready.set()
+                except Exception as e:
+                    logger.error(f"Error in IO output: {e}", exc_info=True)
+                finally:
+                    self._send_done.set()
+        finally:
+            self._send_done.set()
 
     def run_loop(self):
         """
@@ -393,8 +468,10 @@ class IO_Manager():
         print("IO loop started.")
         last_log_time: float = clock()
         frame_count: int = 0
+        changed_count: int = 0 #frames handed to the preview since the last log, stays 0 for a static scene
         actual_period_sum: float = 0.0
         last_tick: float = clock()
+        last_activity: float = clock()
         with HighResolutionTimer() as hrt:
             while self.run:
                 try:
@@ -402,19 +479,27 @@ class IO_Manager():
                     frame_period: float = 1.0 / max(min(self.framerate,60), 1) # Avoid division by zero
 
                     step_start: float = clock()
-                    self.step()
+                    if self.step():
+                        last_activity = step_start
+                        changed_count += 1
                     step_end: float = clock()
                     step_duration: float = step_end - step_start
 
                     # Wait for the remainder of the frame period.
-                    # Sleep the coarse part to release the CPU, then spin-wait
-                    # the tail using perf_counter for sub-ms accuracy.
+                    # While frames are changing sleep the coarse part to release the CPU,
+                    # then spin-wait the tail using perf_counter for sub-ms accuracy.
+                    # When the output has been static for IDLE_AFTER, just sleep: a late
+                    # repeat of the same frame is not visible and the spin would only burn CPU.
                     deadline: float = tick_start + frame_period
                     remaining: float = deadline - clock()
-                    if remaining > self.SLEEP_THRESHOLD:
-                        time.sleep(remaining - self.SLEEP_THRESHOLD)
-                    while clock() < deadline:
-                        pass
+                    if step_end - last_activity >= self.IDLE_AFTER:
+                        if remaining > 0:
+                            time.sleep(remaining)
+                    else:
+                        if remaining > self.SLEEP_THRESHOLD:
+                            time.sleep(remaining - self.SLEEP_THRESHOLD)
+                        while clock() < deadline:
+                            pass
 
                     # Re-request high timer resolution periodically
                     # (Windows may silently reclaim it during long sessions)
@@ -427,10 +512,13 @@ class IO_Manager():
                     frame_count += 1
                     if now - last_log_time >= 2.0:
                         avg_period = actual_period_sum / frame_count if frame_count else 0
+                        idle = now - last_activity >= self.IDLE_AFTER
                         print(f"[IO] target: {frame_period*1000:.1f}ms ({1/frame_period:.0f}fps) | "
-                              f"actual: {avg_period*1000:.1f}ms ({1/avg_period:.0f}fps) | step: {step_duration*1000:.1f}ms")
+                              f"actual: {avg_period*1000:.1f}ms ({1/avg_period:.0f}fps) | step: {step_duration*1000:.1f}ms | "
+                              f"preview: {changed_count} frames{' (idle)' if idle else ''}")
                         last_log_time = now
                         frame_count = 0
+                        changed_count = 0
                         actual_period_sum = 0.0
                 except Exception as e:
                     logger.error(f"Error in IO loop: {e}", exc_info=True)
@@ -484,11 +572,6 @@ class IO_Manager():
         if not getattr(self, 'is_initialized', False):
             return
 
-        # Clean up existing senders
-        if hasattr(self, 'artnet_sender'):
-            self.artnet_sender.stop()
-            del self.artnet_sender
-        
         # Number of segments (columns or rows) that correspond to universes
         num_segments = self.resolution[0] if self.addressing_direction == 'vertical' else self.resolution[1]
         packets_per_universe = self.pixel_channels * (self.resolution[1] if self.addressing_direction == 'vertical' else self.resolution[0])
@@ -497,11 +580,11 @@ class IO_Manager():
         consecutive_count = 0
         
         all_universes = []
-        self.segment_to_universe = {}
+        segment_to_universe = {}
 
         for i in range(num_segments):
             all_universes.append(current_universe)
-            self.segment_to_universe[i] = current_universe
+            segment_to_universe[i] = current_universe
             
             consecutive_count += 1
             if consecutive_count >= self.consecutive_universes:
@@ -510,13 +593,26 @@ class IO_Manager():
             else:
                 current_universe += 1
         
-        self.artnet_sender = StupidArtnet(
-            target_ip=self.output_artnet_ip,
-            universes=all_universes,
-            packet_size=packets_per_universe,
-            fps=self.framerate,
-            port=self.output_artnet_port
-        )
+        try:
+            artnet_sender = StupidArtnet(
+                target_ip=self.output_artnet_ip,
+                universes=all_universes,
+                packet_size=packets_per_universe,
+                fps=self.framerate,
+                port=self.output_artnet_port
+            )
+        except (OSError, ValueError, OverflowError) as error:
+            # e.g. a partially typed ip, keep sending with the previous sender
+            print(f"ERROR: could not create Art-Net output for {self.output_artnet_ip}:{self.output_artnet_port}: {error}")
+            return
+
+        # Clean up existing senders
+        if hasattr(self, 'artnet_sender'):
+            self.artnet_sender.stop()
+            del self.artnet_sender
+
+        self.segment_to_universe = segment_to_universe
+        self.artnet_sender = artnet_sender
         #not needed we will call show ourselves
         #self.artnet_sender.start()
 
@@ -556,9 +652,13 @@ class IO_Manager():
         result = base + round_up.astype(np.uint16)
         return np.clip(result, 0, 255).astype(np.uint8)
 
-    def update_artnet_output(self):
+    def update_artnet_output(self, frame: np.ndarray | None = None) -> bool:
+        """
+        Sends frame, or the current output_buffer if no frame is given, to the Art-Net universes.
+        Returns True if the data of any universe changed, StupidArtnet.set() already compares every universe.
+        """
         if not hasattr(self, 'artnet_sender') or not self.artnet_sender:
-            return
+            return True # nothing to compare against, treat every frame as new
         
         # Check if multiple threads are trying to send data at the same time which can cause issues with StupidArtnet
         current_thread_id = current_thread().ident
@@ -572,7 +672,7 @@ class IO_Manager():
         width, height = self.resolution
 
         # Apply global flips if needed
-        output_buffer = self.output_buffer
+        output_buffer = self.output_buffer if frame is None else frame
         if self.flip_top_bottom:
             output_buffer = np.flip(output_buffer, axis=1) # flip vertically
         if self.flip_left_right:
@@ -587,6 +687,7 @@ class IO_Manager():
             else:
                 output_buffer = OutputCorrection.apply(output_buffer, self.gamma_correction)
         
+        changed = False
         if self.addressing_direction == 'vertical':
             for x in range(width):
                 if x >= len(self.segment_to_universe):
@@ -608,9 +709,9 @@ class IO_Manager():
                 # Get column data
                 segment_data = output_buffer[source_x, :, :]
                 
-                # Flatten data to list of ints for StupidArtnet
-                dmx_values = segment_data.flatten().tolist()
-                self.artnet_sender.set(dmx_values, universe=self.segment_to_universe[x])
+                # Flatten data, StupidArtnet copies the array straight into its universe buffer
+                dmx_values = segment_data.reshape(-1)
+                changed |= self.artnet_sender.set(dmx_values, universe=self.segment_to_universe[x])
         else:
             for y in range(height):
                 if y >= len(self.segment_to_universe):
@@ -627,15 +728,16 @@ class IO_Manager():
                         source_y = reversed_block_idx * self.consecutive_universes + idx_in_block
 
                 # Get row data
-                segment_data = self.output_buffer[:, source_y, :]
+                segment_data = output_buffer[:, source_y, :]
                 
                 if self.reverse_addressing:
                     segment_data = np.flip(segment_data, axis=0) # flip horizontally
                 
-                dmx_values = segment_data.flatten().tolist()
-                self.artnet_sender.set(dmx_values, universe=self.segment_to_universe[y])
+                dmx_values = segment_data.reshape(-1)
+                changed |= self.artnet_sender.set(dmx_values, universe=self.segment_to_universe[y])
 
         self.artnet_sender.show()
+        return changed
 
     def update_DMX_channels(self, channels):
         self.dmx_channel_inputs.update_sliders(channels)
@@ -671,7 +773,9 @@ class IO_Manager():
 
         self.preview_timer = preview_setup(self.preview_image, get_preview_frame=None, io_manager=self)
 
+@functools.cache
 def get_local_ip():
+    """IP of the interface used for outgoing traffic, looked up once per process"""
     import socket
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
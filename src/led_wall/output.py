@@ -1,5 +1,6 @@
 
 import asyncio
+import numpy as np
 from pyartnet import ArtNetNode
 
 from led_wall.pixels import LedPixelArray, LedPixel
@@ -26,13 +27,14 @@ class H807SA():
             self.universes.append(self.node.add_universe(i))
             self.channels.append(self.universes[i].add_channel(start=START_ID, width=CHANNELS_PER_PIXEL*height))
 
-    def set_outputs(self, data:list[list[int]]) -> None:
+    def set_outputs(self, data:list[list[int]] | np.ndarray) -> None:
         """Set the output data for all channels.
 
         TODO: data write is done automatically by the ArtNetNode, revisit this for syncronous updates.
         
         Args:
-            data (list[list[int]]): A list of lists, where each inner list corresponds to led strips data and the outer list corresponds to each led strip.
+            data (list[list[int]] | np.ndarray): A list of lists, where each inner list corresponds to led strips data and the outer list corresponds to each led strip.
+                A numpy array of shape (width, height*4) is converted row by row, pyartnet validates the values.
         """
         if len(data) != len(self.channels):
             raise ValueError("Data length must match number of channels")
@@ -40,7 +42,8 @@ class H807SA():
         for i, channel in enumerate(self.channels):
             #if len(data[i]) != channel.width:
             #    raise ValueError(f"Data for channel {i} does not match expected width")
-            channel.set_values(data[i])
+            values = data[i]
+            channel.set_values(values.tolist() if isinstance(values, np.ndarray) else values)
 
 
 
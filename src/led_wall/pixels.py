@@ -1,38 +1,44 @@
+import numpy as np
+
+# column index of r, g, b, w for every supported output order
+ORDER_INDEX = {
+    "rgbw": [0, 1, 2, 3],
+    "rgwb": [0, 1, 3, 2],
+    "rwgb": [0, 3, 1, 2],
+    "bgrw": [2, 1, 0, 3],
+    "bgwr": [2, 1, 3, 0],
+    "wbrg": [3, 2, 0, 1],
+}
+
+def _check_color(r, g, b, w):
+    if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255 and 0 <= w <= 255):
+        raise ValueError("Color values must be between 0 and 255")
 
 
 class LedPixel():
-    def __init__(self, r=0, g=0, b=0, w=0, order="rgbw"):
-        self.r = r
-        self.g = g
-        self.b = b
-        self.w = w
+    """A single RGBW pixel, stored as a row of 4 uint8 values (r, g, b, w).
+
+    Pixels of a LedPixelArray are views into the array's data, so setting a color writes straight into the array.
+    """
+    def __init__(self, r=0, g=0, b=0, w=0, order="rgbw", data:np.ndarray|None=None):
+        self.data = data if data is not None else np.zeros(4, dtype=np.uint8)
+        self.data[:] = (r, g, b, w)
 
         self.order = order.lower()
 
+    r = property(lambda self: int(self.data[0]), lambda self, v: self.data.__setitem__(0, v))
+    g = property(lambda self: int(self.data[1]), lambda self, v: self.data.__setitem__(1, v))
+    b = property(lambda self: int(self.data[2]), lambda self, v: self.data.__setitem__(2, v))
+    w = property(lambda self: int(self.data[3]), lambda self, v: self.data.__setitem__(3, v))
+
     def as_bytes(self):
-        if self.order == "rgbw":
-            return bytes([self.r, self.g, self.b, self.w])
-        elif self.order == "rgwb":
-            return bytes([self.r, self.g, self.w, self.b])
-        elif self.order == "rwgb":
-            return bytes([self.r, self.w, self.g, self.b])
-        elif self.order == "bgrw":
-            return bytes([self.b, self.g, self.r, self.w])
-        elif self.order == "bgwr":
-            return bytes([self.b, self.g, self.w, self.r])
-        elif self.order == "wbrg":
-            return bytes([self.w, self.b, self.r, self.g])
-        else:
+        if self.order not in ORDER_INDEX:
             raise ValueError("Invalid order specified")
-        
+        return self.data[ORDER_INDEX[self.order]].tobytes()
+
     def setColor(self, r, g, b, w):
-        if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255 and 0 <= w <= 255):
-            raise ValueError("Color values must be between 0 and 255")
-        
-        self.r = r
-        self.g = g
-        self.b = b
-        self.w = w
+        _check_color(r, g, b, w)
+        self.data[:] = (r, g, b, w)
 
     @staticmethod
     def to_data_list(led_pixels:list["LedPixel"]) -> list[int]:
@@ -40,7 +46,7 @@ class LedPixel():
         for led in led_pixels:
             if not isinstance(led, LedPixel):
                 raise TypeError("All elements must be of type LedPixel")
-            
+
             output.extend([led.r, led.g, led.b, led.w])
 
         return output
@@ -51,15 +57,20 @@ class LedPixel():
         for led in led_pixels:
             if not isinstance(led, LedPixel):
                 raise TypeError("All elements must be of type LedPixel")
-            
+
             output.extend(led.as_bytes())
 
         return bytes(output)
-    
+
 class LedPixelArray():
+    """Pixels stored in one contiguous (num_pixels, 4) uint8 array in r, g, b, w order.
+
+    Use `data` for vectorized writes, e.g. `array.data[:10] = (255, 0, 0, 0)`.
+    """
     def __init__(self, num_pixels, order="rgbw"):
-        self.pixels = [LedPixel(order=order) for _ in range(num_pixels)]
         self.order = order
+        self.data = np.zeros((num_pixels, self.channels_per_pixel()), dtype=np.uint8)
+        self.pixels = [LedPixel(order=order, data=self.data[i]) for i in range(num_pixels)]
 
     def set_pixel_color(self, index, r, g, b, w):
         if index < 0 or index >= len(self.pixels):
@@ -67,18 +78,25 @@ class LedPixelArray():
         self.pixels[index].setColor(r, g, b, w)
 
     def set_all_pixels_color(self, r, g, b, w):
-        for pixel in self.pixels:
-            pixel.setColor(r, g, b, w)
+        _check_color(r, g, b, w)
+        self.data[:] = (r, g, b, w)
 
     def to_bytes(self):
-        return LedPixel.to_bytes(self.pixels)
-    
+        if self.order.lower() not in ORDER_INDEX:
+            raise ValueError("Invalid order specified")
+        return self.data[:, ORDER_INDEX[self.order.lower()]].tobytes()
+
     def to_data_list(self):
-        return LedPixel.to_data_list(self.pixels)    
+        return self.data.ravel().tolist()
+
+    @property
+    def buffer(self) -> memoryview:
+        """Flat byte view of the pixel data in r, g, b, w order, can be copied into a packet without converting to ints."""
+        return memoryview(self.data).cast("B")
 
     def __len__(self):
         return len(self.pixels)
-    
+
     def channels_per_pixel(self):
         if self.order == "rgbw":
             return 4
@@ -86,4 +104,3 @@ class LedPixelArray():
             return 4
         else:
             raise ValueError("Invalid order specified")
-
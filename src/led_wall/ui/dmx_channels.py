@@ -81,6 +81,13 @@ class DMX_channels_Input():
         """
         return [value for value in self.channels.values()]
 
+    def get_channels_np(self) -> np.ndarray:
+        """
+        Returns the current values of all channels as a float32 array, without building an intermediate list.
+        :return: Array of channel values.
+        """
+        return np.fromiter(self.channels.values(), dtype=np.float32, count=self.n_channels)
+
 if __name__ in {"__main__", "__mp_main__"}:
     import threading
 
@@ -119,7 +119,19 @@ def preview_setup(video_image:ui.interactive_image,webcam:bool = False,get_previ
     # A timer constantly updates the source of the image.
     # Because data from same paths is cached by the browser,
     # we must force an update by adding the current timestamp to the source.
-    timer = ui.timer(interval=interval, callback=lambda: video_image.set_source(f'{url_path}?{time.time()}'))
+    # With an io_manager the image is only reloaded when the loop rendered a new frame since the last reload,
+    # so a stopped or suspended loop causes no requests and no JPEG encoding.
+    def refresh_source() -> None:
+        if io_manager is not None:
+            if not io_manager.frame_ready.is_set():
+                return
+            io_manager.frame_ready.clear()
+        video_image.set_source(f'{url_path}?{time.time()}')
+
+    # load the current frame once right away, a static scene never sets frame_ready
+    # so a new client or a reopened preview would otherwise stay blank
+    video_image.set_source(f'{url_path}?{time.time()}')
+    timer = ui.timer(interval=interval, callback=refresh_source)
     
     async def disconnect() -> None:
         """Disconnect all clients from current running server."""
@@ -4,6 +4,13 @@ from typing import TYPE_CHECKING
 import threading
 import json
 import logging
+import os
+import time
+
+try:
+    import orjson  # declared dependency (no wheels for 32 bit x86), much faster than json to parse the settings tree
+except ImportError:
+    orjson = None
 
 from nicegui import ui
 from nicegui.events import ValueChangeEventArguments
@@ -25,9 +32,15 @@ class SettingsManager:
         self.name = name
         self.path = path
 
-        self.timeout_thread = None
+        # single background saver, every change pushes the save deadline back (debounce)
+        self._saver_thread: threading.Thread | None = None
+        self._saver_lock = threading.Lock()
+        self._save_deadline: float = 0.0
+        self._write_lock = threading.Lock()  # a new saver can start while the previous one is still writing
 
         self._settings_change_callbacks: dict[str, list[callable]] = {}
+        self._children: dict[str, SettingsManager] = {}
+        self.version: int = 0 # bumped on every change, lets users cache values derived from the settings
 
         #load settings from parent if provided
         if parent is not None:
@@ -36,6 +49,15 @@ class SettingsManager:
         elif path is not None:
             self.load_from_file()
 
+    def child(self, name: str) -> SettingsManager:
+        """
+        Returns the child SettingsManager with the given name, it is created on first use and reused afterwards.
+        """
+        child = self._children.get(name)
+        if child is None:
+            child = self._children[name] = SettingsManager(parent=self, name=name)
+        return child
+
     def init_setting_element(self, element: SettingsElement, key: str) -> None:
         """
         Initializes a settings element by registering it and loading the saved value or default value.
@@ -43,6 +65,7 @@ class SettingsManager:
 
         element.value = self.settings.get(key, element.default_value)
         self.settings[element.settings_id] = element.value #save setting into dict
+        self.version += 1
 
         self.settings_elements.append(element)
 
@@ -53,6 +76,7 @@ class SettingsManager:
         """
         if isinstance(element, SettingsElement):
             self.settings[element.settings_id] = value
+            self.version += 1 # after the write, a reader that sees the new version also sees the new value
 
             if element == "all":
                 for key in self.settings:
@@ -68,6 +92,7 @@ class SettingsManager:
         elif isinstance(element, SettingsManager):
             if element.name is not None:
                 self.settings[element.name] = value
+                self.version += 1
         else:
             raise ValueError("element must be of type SettingsElement or SettingsManager") 
 
@@ -102,6 +127,7 @@ class SettingsManager:
         else:
             # Fallback if element not found: update dict directly and trigger save
             self.settings[setting_id] = value
+            self.version += 1
             if self.parent:
                 self.parent.settings_change(self, self.settings)
             elif self.path:
@@ -111,21 +137,41 @@ class SettingsManager:
 
     def save_with_timeout(self) -> None:
         """
-        Saves the file if no changes after the SAVE_TIMEOUT.
+        Schedules a save SAVE_TIMEOUT after the last change, all changes until then are written together.
         """
-        if self.timeout_thread is not None:
-            self.timeout_thread.cancel()
+        with self._saver_lock:
+            self._save_deadline = time.monotonic() + self.SAVE_TIMEOUT
+            if self._saver_thread is None:
+                self._saver_thread = threading.Thread(target=self._saver, name="SettingsSaver")
+                self._saver_thread.start()
 
-        self.timeout_thread = threading.Timer(self.SAVE_TIMEOUT, self.save_to_file)
-        self.timeout_thread.start()
+    def _saver(self) -> None:
+        """
+        Waits until no change happened for SAVE_TIMEOUT, writes the settings once and exits.
+        """
+        while True:
+            with self._saver_lock:
+                remaining = self._save_deadline - time.monotonic()
+                if remaining <= 0:
+                    self._saver_thread = None
+                    break
+            time.sleep(remaining)
+        try:
+            self.save_to_file()
+        except Exception as e:
+            logger.error(f"Error saving settings to {self.path}: {e}")
 
     def save_to_file(self) -> None:
         """
         Saves the current settings to a file.
         """
-        # Writing to a JSON file with indentation
-        with open(self.path, "w") as outfile:
-            json.dump(self.settings, outfile, indent=4)
+        # Write to a temporary file first so a crash mid-write never leaves a truncated settings file
+        tmp_path = self.path + ".tmp"
+        # always written with json: orjson only supports 2 space indentation, the file keeps its 4 space format
+        with self._write_lock:
+            with open(tmp_path, "w") as outfile:
+                json.dump(self.settings, outfile, indent=4)
+            os.replace(tmp_path, self.path)
 
     def load_from_file(self) -> None:
         """
@@ -133,8 +179,13 @@ class SettingsManager:
         """
         path = self.path
         try:
-            with open(path, "r") as infile:
-                self.settings = json.load(infile)
+            if orjson is not None:
+                with open(path, "rb") as infile:
+                    self.settings = orjson.loads(infile.read())
+            else:
+                with open(path, "r") as infile:
+                    self.settings = json.load(infile)
+            self.version += 1
 
         except FileNotFoundError:
             logger.warning(f"Settings file {path} not found. Using default settings.")
@@ -153,6 +204,7 @@ class SettingsManager:
 
 class SettingsElement():
     """SettingsElement is a custom input element for the settings page."""
+    __slots__ = ('label', 'input', 'default_value', 'on_change', 'manager', 'settings_id', 'value', 'options')
 
     def __init__(self,
                  label: str,
@@ -202,6 +254,7 @@ class SettingsElement():
 
 class HiddenSettingsElement(SettingsElement):
     """A settings element that stores a value (list or dict) without any UI."""
+    __slots__ = ()
 
     def __init__(self,
                  default_value: list | dict,
@@ -51,6 +51,11 @@ class Fader(InputType):
         self.n_channels = 1
         self.slider = None
 
+    @property
+    def normalized(self) -> float:
+        """The fader value scaled to 0..1."""
+        return self.value / 255.0
+
     def get_channels(self) -> list[int]:
         """Returns the fader value as a list."""
         return [self.value]